@@ -48,6 +48,17 @@ def check_column_exists(cursor, table_name, column_name):
     return cursor.fetchone()[0]
 
 
+def create_covering_index(cursor):
+    """Create the covering index get_option_data_from_db range-scans by date without a sort"""
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_options_data_covering
+        ON options_data (symbol, strike, "right", expiration, bar_interval, date)
+        INCLUDE ("open", high, low, "close", volume, implied_volatility);
+    """
+    )
+
+
 def add_iv_column_migration():
     """Add implied_volatility column to options_data table"""
     print("=" * 80)
@@ -87,6 +98,9 @@ def add_iv_column_migration():
 
         if column_exists:
             print("   Column already exists: implied_volatility")
+            create_covering_index(cursor)
+            conn.commit()
+            print("   Index ensured: idx_options_data_covering")
             print("   Migration already applied, skipping...")
             return True
 
@@ -112,6 +126,10 @@ def add_iv_column_migration():
         )
         print("   Index created: idx_options_iv")
 
+        # Covering index needs the new column, so it is created here rather than with the table
+        create_covering_index(cursor)
+        print("   Index created: idx_options_data_covering")
+
         # Commit changes
         conn.commit()
         print("\n6. Committing changes to database...")
@@ -10,6 +10,7 @@ import pandas as pd
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'services'))
 
 from ibkr_data_service import ibkr_service
+from market_data import invalidate_cached_loads
 
 # Create blueprint
 market_data_bp = Blueprint('market_data', __name__)
@@ -20,6 +21,9 @@ def refresh_market_data(symbol):
     """Manually refresh market data for a symbol"""
     try:
         result = ibkr_service.refresh_data(symbol.upper())
+        if result['success']:
+            # Later simulations in this process must re-read the refreshed bars
+            invalidate_cached_loads(symbol.upper())
         return jsonify(result), 200 if result['success'] else 500
     except Exception as e:
         return jsonify({
@@ -2,10 +2,11 @@
 
 import logging
 import os
+import queue
 import threading
 import time
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable
 
 import pandas as pd
 import psycopg2
@@ -32,6 +33,9 @@ DB_CONFIG = {
     "port": os.environ.get("DB_PORT", "5432"),
 }
 
+# Connection kwargs with unset values dropped, computed once rather than per connection
+_DB_CONNECT_KWARGS = {k: v for k, v in DB_CONFIG.items() if v is not None}
+
 # IBKR configuration
 IBKR_CONFIG = {
     "host": os.environ.get("IBKR_HOST", "127.0.0.1"),
@@ -39,6 +43,22 @@ IBKR_CONFIG = {
     "client_id": int(os.environ.get("IBKR_CLIENT_ID", "123")),
 }
 
+# Maximum wait for the API handshake (nextValidId) after opening the socket
+CONNECT_TIMEOUT_SECONDS = 5
+
+# Bars buffered before a streaming client hands a batch to its writer thread
+STREAM_BATCH_SIZE = 500
+
+# Column dtypes for market_data reads, passed to read_sql_query so it skips per-column inference.
+# Prices stay float64 (DECIMAL(10,4) loses cents in float32); volume is COALESCEd so int64 always fits.
+_MARKET_DATA_DTYPES = {
+    'open': 'float64',
+    'high': 'float64',
+    'low': 'float64',
+    'close': 'float64',
+    'volume': 'int64',
+}
+
 
 class IBKRDataClient(EWrapper, EClient):
     """IBKR API client for fetching historical market data"""
@@ -47,10 +67,17 @@ class IBKRDataClient(EWrapper, EClient):
         EClient.__init__(self, self)
         self.client_id = client_id
         self.data = []
+        self.bar_count = 0
         self.data_received = threading.Event()
         self.connection_successful = threading.Event()
         self.error_occurred = False
         self.error_message = ""
+
+        # Streaming state (see start_streaming)
+        self._buffer_lock = threading.Lock()
+        self._write_queue = None
+        self._writer_thread = None
+        self._stream_error = None
         
     def nextValidId(self, orderId: int):
         """Called when connection is established"""
@@ -68,19 +95,77 @@ class IBKRDataClient(EWrapper, EClient):
     def historicalData(self, reqId: int, bar):
         """Receive historical data bars"""
         logger.info(f"Received bar: reqId={reqId}, date={bar.date}, close={bar.close}")
-        self.data.append({
-            'date': bar.date,
-            'open': bar.open,
-            'high': bar.high,
-            'low': bar.low,
-            'close': bar.close,
-            'volume': bar.volume
-        })
+        with self._buffer_lock:
+            self.data.append({
+                'date': bar.date,
+                'open': bar.open,
+                'high': bar.high,
+                'low': bar.low,
+                'close': bar.close,
+                'volume': bar.volume
+            })
+            self.bar_count += 1
+
+            # Streaming: hand the full buffer to the writer and keep receiving into a fresh one
+            if self._write_queue is not None and len(self.data) >= STREAM_BATCH_SIZE:
+                batch, self.data = self.data, []
+                self._write_queue.put(batch)
     
     def historicalDataEnd(self, reqId: int, start: str, end: str):
         """Called when historical data request is complete"""
-        logger.info(f"Historical data request {reqId} completed. Received {len(self.data)} bars")
+        logger.info(f"Historical data request {reqId} completed. Received {self.bar_count} bars")
+        self._flush_stream()
         self.data_received.set()
+
+    def start_streaming(self, sink: Callable[[List[Dict]], None]):
+        """Stream bars to sink in STREAM_BATCH_SIZE batches while the request is still running
+
+        sink is called from a dedicated writer thread, so DB writes overlap with IBKR
+        receive and the full history is never buffered in memory at once.
+        """
+        self._write_queue = queue.Queue()
+        self._stream_error = None
+
+        def write_loop():
+            while True:
+                batch = self._write_queue.get()
+                try:
+                    if batch is None:
+                        return
+                    if self._stream_error is None:
+                        sink(batch)
+                except Exception as e:
+                    self._stream_error = e
+                finally:
+                    self._write_queue.task_done()
+
+        self._writer_thread = threading.Thread(target=write_loop, daemon=True)
+        self._writer_thread.start()
+
+    def _flush_stream(self):
+        """Hand any buffered bars to the writer thread (no-op when not streaming)"""
+        with self._buffer_lock:
+            if self._write_queue is not None and self.data:
+                batch, self.data = self.data, []
+                self._write_queue.put(batch)
+
+    def stop_streaming(self):
+        """Flush remaining bars, wait for the writer thread to drain and stop it
+
+        Raises:
+            Exception: The first error raised by the sink, if any
+        """
+        if self._write_queue is None:
+            return
+
+        self._flush_stream()
+        self._write_queue.put(None)
+        self._writer_thread.join()
+        self._write_queue = None
+        self._writer_thread = None
+
+        if self._stream_error is not None:
+            raise self._stream_error
     
     def connect_to_ibkr(self, host: str = "127.0.0.1", port: int = 7496) -> bool:
         """Connect to IBKR TWS/Gateway - exact approach from loading_data.py"""
@@ -98,7 +183,11 @@ class IBKRDataClient(EWrapper, EClient):
         api_thread = threading.Thread(target=run_loop, daemon=True)
         api_thread.start()
         
-        time.sleep(1)  # Sleep interval to allow time for connection to server
+        # nextValidId sets connection_successful once the API handshake completes
+        if not self.connection_successful.wait(timeout=CONNECT_TIMEOUT_SECONDS):
+            logger.error(f"IBKR connect timed out after {CONNECT_TIMEOUT_SECONDS}s")
+            self.disconnect()
+            return False
         return True
     
     def fetch_historical_data(self, symbol: str, period: str = "10 Y", bar_size: str = "1 day") -> List[Dict]:
@@ -131,7 +220,9 @@ class IBKRDataClient(EWrapper, EClient):
                 data_type = "MIDPOINT"
             
             # Initialize variable to store candle (exactly like loading_data.py)
-            self.data = []
+            with self._buffer_lock:
+                self.data = []
+                self.bar_count = 0
             
             # Request historical candles
             req_id = 0  # Use 0 like in loading_data.py (stock_list.index(i))
@@ -140,13 +231,20 @@ class IBKRDataClient(EWrapper, EClient):
             # sleep to allow enough time for data to be returned (extend for larger datasets)
             time.sleep(10)
             
-            logger.info(f"Raw data received: {self.data}")
+            logger.info(f"Raw data received: {self.bar_count} bars")
             
-            if len(self.data) < 1:
+            if self.bar_count < 1:
                 raise Exception(f'faliled loading data for {symbol}. try it again')  # Exact message
             
             logger.info(f'finish the loading data for {symbol}')
-            return self.data.copy()
+
+            # When streaming, the remaining bars go to the writer rather than the caller
+            self._flush_stream()
+
+            # Hand the buffer to the caller instead of copying it; the next request starts a fresh list
+            with self._buffer_lock:
+                result, self.data = self.data, []
+            return result
                 
         except Exception as e:
             logger.error(f"Error fetching data for {symbol}: {str(e)}")
@@ -166,11 +264,13 @@ class IBKRDataService:
     
     def __init__(self):
         self.client = None
+        # IBKR fetches share self.client and one client id, so callers on other threads take turns
+        self._fetch_lock = threading.Lock()
     
     def get_db_connection(self):
         """Get database connection"""
         try:
-            return psycopg2.connect(**{k: v for k, v in DB_CONFIG.items() if v is not None})
+            return psycopg2.connect(**_DB_CONNECT_KWARGS)
         except Exception as e:
             logger.error(f"Database connection error: {str(e)}")
             raise
@@ -222,8 +322,8 @@ class IBKRDataService:
 
         Args:
             symbol: Trading symbol
-            start_date: Start date in 'YYYY-MM-DD' format
-            end_date: End date in 'YYYY-MM-DD' format
+            start_date: Start date in 'YYYY-MM-DD' format or as a datetime/Timestamp
+            end_date: End date in 'YYYY-MM-DD' format or as a datetime/Timestamp
             bar_interval: Bar interval (default: '1 day', can be '30 mins', '1 hour', etc.)
 
         Returns:
@@ -232,16 +332,17 @@ class IBKRDataService:
         conn = self.get_db_connection()
         try:
             query = """
-                SELECT symbol, date, open, high, low, close, volume
+                SELECT symbol, date, open, high, low, close, COALESCE(volume, 0) AS volume
                 FROM market_data
                 WHERE symbol = %s AND date >= %s AND date <= %s AND bar_interval = %s
                 ORDER BY date
             """
 
-            df = pd.read_sql_query(query, conn, params=(symbol, start_date, end_date, bar_interval))
-            if not df.empty:
-                df['date'] = pd.to_datetime(df['date'])
-                df.set_index('date', inplace=True)
+            # Typed read: dtypes, date parsing and the index are applied inside read_sql_query
+            df = pd.read_sql_query(
+                query, conn, params=(symbol, start_date, end_date, bar_interval),
+                index_col='date', parse_dates=['date'], dtype=_MARKET_DATA_DTYPES
+            )
 
             logger.info(f"Retrieved {len(df)} records from DB for {symbol} (interval={bar_interval})")
             return df
@@ -321,33 +422,38 @@ class IBKRDataService:
         Returns:
             bool: True if successful, False otherwise
         """
-        try:
-            # Connect to IBKR
-            self.client = IBKRDataClient(IBKR_CONFIG["client_id"])
-            if not self.client.connect_to_ibkr(IBKR_CONFIG["host"], IBKR_CONFIG["port"]):
-                raise Exception("Failed to connect to IBKR")
+        with self._fetch_lock:
+            try:
+                # Connect to IBKR
+                self.client = IBKRDataClient(IBKR_CONFIG["client_id"])
+                if not self.client.connect_to_ibkr(IBKR_CONFIG["host"], IBKR_CONFIG["port"]):
+                    raise Exception("Failed to connect to IBKR")
 
-            # Fetch data
-            logger.info(f"Fetching {period} of data for {symbol} with bar_size={bar_size}")
-            data = self.client.fetch_historical_data(symbol, period, bar_size)
-
-            if data:
                 # Save to database — SPY_DIV always stored with interval='dividends'
                 # regardless of bar_size used for the TWS request
                 db_interval = "dividends" if symbol == "SPY_DIV" else bar_size
-                self.save_data_to_db(symbol, data, db_interval)
-                logger.info(f"Successfully fetched and stored data for {symbol}")
-                return True
-            else:
-                logger.warning(f"No data received for {symbol}")
-                return False
 
-        except Exception as e:
-            logger.error(f"Error fetching data for {symbol}: {str(e)}")
-            return False
-        finally:
-            if self.client:
-                self.client.disconnect_from_ibkr()
+                # Fetch data, writing bars to the database in batches as they arrive
+                logger.info(f"Fetching {period} of data for {symbol} with bar_size={bar_size}")
+                self.client.start_streaming(lambda batch: self.save_data_to_db(symbol, batch, db_interval))
+                try:
+                    self.client.fetch_historical_data(symbol, period, bar_size)
+                finally:
+                    self.client.stop_streaming()
+
+                if self.client.bar_count:
+                    logger.info(f"Successfully fetched and stored {self.client.bar_count} bars for {symbol}")
+                    return True
+                else:
+                    logger.warning(f"No data received for {symbol}")
+                    return False
+
+            except Exception as e:
+                logger.error(f"Error fetching data for {symbol}: {str(e)}")
+                return False
+            finally:
+                if self.client:
+                    self.client.disconnect_from_ibkr()
     
     def get_market_data(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
         """Get market data with DB-first approach, fallback to IBKR"""
@@ -360,22 +466,26 @@ class IBKRDataService:
                 start_dt = pd.to_datetime(start_date)
                 end_dt = pd.to_datetime(end_date)
                 
-                logger.info(f"DB coverage check - DB range: {df.index.min()} to {df.index.max()}")
+                # Query is ORDER BY date, so the endpoints are the first/last index entries
+                db_start = df.index[0]
+                db_end = df.index[-1]
+
+                logger.info(f"DB coverage check - DB range: {db_start} to {db_end}")
                 logger.info(f"Requested range: {start_dt} to {end_dt}")
                 
                 # Check if we have data for the full range, accounting for weekends/holidays
                 # Allow for reasonable gaps at the start/end due to non-trading days
                 
                 # Check if DB start is within 5 days of requested start (handles weekends/holidays)
-                start_gap_days = (df.index.min() - start_dt).days
-                end_gap_days = (end_dt - df.index.max()).days
+                start_gap_days = (db_start - start_dt).days
+                end_gap_days = (end_dt - db_end).days
                 
                 logger.info(f"Gap analysis - Start gap: {start_gap_days} days, End gap: {end_gap_days} days")
                 
                 # Allow up to 5 days gap for weekends/holidays at start and end
                 if start_gap_days >= -5 and start_gap_days <= 5 and end_gap_days >= -5 and end_gap_days <= 5:
                     logger.info(f"Complete data found in DB for {symbol}")
-                    return df[start_dt:end_dt]
+                    return df.loc[start_dt:end_dt]
             
             # If data is missing, fetch from IBKR
             logger.info(f"Incomplete data in DB, fetching from IBKR for {symbol}")
@@ -1,19 +1,30 @@
 """Interactive Brokers API option data service for TradingHub"""
 
+import csv
+import heapq
+import io
 import logging
 import os
+import queue
+import re
+import sys
 import threading
-import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, NamedTuple
 
 import pandas as pd
 import psycopg2
+import psycopg2.extensions
 from dotenv import load_dotenv
 from ibapi.client import EClient
 from ibapi.contract import Contract
 from ibapi.wrapper import EWrapper
-from psycopg2.extras import DictCursor
+from psycopg2.extras import DictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 
 # Load environment variables
 env_path = os.path.join(os.path.dirname(__file__), ".env")
@@ -32,6 +43,24 @@ DB_CONFIG = {
     "port": os.environ.get("DB_PORT", "5432"),
 }
 
+# Connection kwargs with unset values dropped, computed once rather than per connection
+_DB_CONNECT_KWARGS = {k: v for k, v in DB_CONFIG.items() if v is not None}
+
+# Shared connection pool, created on first use so importing the module never touches the DB
+DB_POOL_MIN_CONN = 1
+DB_POOL_MAX_CONN = 8
+_DB_POOL: Optional[ThreadedConnectionPool] = None
+_DB_POOL_LOCK = threading.Lock()
+
+
+def _get_db_pool() -> ThreadedConnectionPool:
+    """Create the module connection pool on first use"""
+    global _DB_POOL
+    with _DB_POOL_LOCK:
+        if _DB_POOL is None:
+            _DB_POOL = ThreadedConnectionPool(DB_POOL_MIN_CONN, DB_POOL_MAX_CONN, **_DB_CONNECT_KWARGS)
+        return _DB_POOL
+
 # IBKR configuration
 IBKR_CONFIG = {
     "host": os.environ.get("IBKR_HOST", "127.0.0.1"),
@@ -39,6 +68,158 @@ IBKR_CONFIG = {
     "client_id": int(os.environ.get("IBKR_CLIENT_ID", "124")),  # Different from stock client
 }
 
+# Maximum wait for the API handshake (nextValidId) after opening the socket
+CONNECT_TIMEOUT_SECONDS = 5
+
+# Number of persistent clients used by IBKROptionService.fetch_many (each gets its own client_id)
+OPTION_CLIENT_POOL_SIZE = int(os.environ.get("IBKR_OPTION_POOL_SIZE", "4"))
+
+# Tags for the two reqHistoricalData requests of a fetch; each fetch allocates fresh request ids,
+# so callbacks still arriving for an earlier (timed-out) fetch are recognised and dropped
+TRADES_REQUEST = "TRADES"
+IV_REQUEST = "IV"
+
+# Combined wait for the TRADES and IV requests, which are in flight at the same time
+FETCH_TIMEOUT_SECONDS = 30
+
+# UNLOGGED staging table used by bulk backfills (no WAL, merged into options_data in one pass)
+OPTION_STAGE_TABLE = "options_stage_unlogged"
+
+# Batches below this size go through the prepared unnest upsert; larger ones through execute_values
+SMALL_BATCH_ROWS = 500
+
+# Saves above this many bars skip row-wise SQL and go through the COPY staging path
+COPY_SAVE_THRESHOLD_ROWS = 5000
+
+# Rows per execute_values statement (PostgreSQL insert throughput plateaus around 1000-row batches)
+EXECUTE_VALUES_PAGE_SIZE = 1000
+
+# Number of get_option_data_from_db results kept in the per-service LRU cache
+OPTION_QUERY_CACHE_SIZE = 128
+
+# Rows fetched per round trip by the server-side cursor in get_option_data_from_db
+OPTION_QUERY_ITERSIZE = 10000
+
+# NUMERIC -> float typecaster, registered per query cursor so the conversion happens in the driver
+# (other users of the pooled connections still get Decimal)
+_DECIMAL_TO_FLOAT = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values,
+    'DEC2FLOAT',
+    lambda value, cursor: float(value) if value is not None else None
+)
+
+# Column dtypes of the frame returned by get_option_data_from_db
+_OPTION_FRAME_DTYPES = {
+    'open': 'float64',
+    'high': 'float64',
+    'low': 'float64',
+    'close': 'float64',
+    'volume': 'float64',
+    'implied_volatility': 'float64',
+}
+
+# options_data upsert, split around the VALUES list so each save path can supply its own rows
+_OPTION_INSERT_INTO_SQL = """
+    INSERT INTO options_data
+        (symbol, strike, "right", expiration, date, "open", high, low, "close", volume,
+         implied_volatility, bar_interval)
+"""
+_OPTION_INSERT_SQL = _OPTION_INSERT_INTO_SQL + "    VALUES "
+_OPTION_ROW_TEMPLATE = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+_OPTION_ON_CONFLICT_SQL = """
+    ON CONFLICT (symbol, strike, "right", expiration, date, bar_interval)
+    DO UPDATE SET
+        "open" = EXCLUDED."open",
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        "close" = EXCLUDED."close",
+        volume = EXCLUDED.volume,
+        implied_volatility = EXCLUDED.implied_volatility,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+# Server-side prepared upsert taking one array per column, so a save is a single EXECUTE whose
+# statement is parsed and planned once per pooled connection rather than on every call
+_OPTION_UPSERT_STATEMENT = "opt_upsert"
+_OPTION_PREPARE_SQL = (
+    f"PREPARE {_OPTION_UPSERT_STATEMENT} "
+    "(text[], numeric[], text[], date[], timestamp[], numeric[], numeric[], numeric[], numeric[], "
+    "bigint[], numeric[], text[]) AS"
+    + _OPTION_INSERT_INTO_SQL
+    + "    SELECT * FROM unnest($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)"
+    + _OPTION_ON_CONFLICT_SQL
+)
+_OPTION_EXECUTE_SQL = f"EXECUTE {_OPTION_UPSERT_STATEMENT} ({', '.join(['%s'] * 12)})"
+
+# Pooled connections whose session already holds the prepared upsert
+_PREPARED_CONNECTIONS = weakref.WeakSet()
+
+
+def _ensure_upsert_prepared(conn):
+    """PREPARE the options_data upsert on this connection's session if it is not there yet"""
+    if conn in _PREPARED_CONNECTIONS:
+        return
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_prepared_statements WHERE name = %s", (_OPTION_UPSERT_STATEMENT,))
+        if cursor.fetchone() is None:
+            cursor.execute(_OPTION_PREPARE_SQL)
+    # Commit on its own so a later rollback of the data transaction cannot affect the statement
+    conn.commit()
+    _PREPARED_CONNECTIONS.add(conn)
+
+
+# Runs of spaces inside IBKR dates (intraday bars arrive as "20240101  09:30:00")
+_MULTI_SPACE_RE = re.compile(r' {2,}')
+
+
+def _parse_bar_dates(raw_dates: List[str]) -> pd.DatetimeIndex:
+    """
+    Parse a batch of IBKR bar dates in one vectorized pass
+
+    Args:
+        raw_dates: IBKR date strings - daily "20240101" or intraday "20240101  09:30:00"
+
+    Returns:
+        DatetimeIndex aligned with raw_dates (NaT where a date could not be parsed)
+    """
+    if not raw_dates:
+        return pd.DatetimeIndex([])
+
+    # Collapse the double space for the whole batch with one regex call (dates never contain newlines)
+    normalized = _MULTI_SPACE_RE.sub(' ', '\n'.join(raw_dates)).split('\n')
+    dates = pd.Series(normalized, dtype=object).str.strip()
+    intraday = dates.str.contains(' ', regex=False)
+    parsed = pd.Series(pd.NaT, index=dates.index, dtype='datetime64[ns]')
+
+    if intraday.any():
+        # Intraday: "20240101 09:30:00"
+        parsed[intraday] = pd.to_datetime(dates[intraday], format='%Y%m%d %H:%M:%S', errors='coerce')
+    if not intraday.all():
+        # Daily: "20240101"
+        parsed[~intraday] = pd.to_datetime(dates[~intraday], format='%Y%m%d', errors='coerce')
+
+    unparsed = parsed.isna()
+    if unparsed.any():
+        logger.error(f"Could not parse {int(unparsed.sum())} dates: {dates[unparsed].tolist()}")
+
+    return pd.DatetimeIndex(parsed)
+
+
+class PriceBar(NamedTuple):
+    """One option TRADES bar as buffered by IBKROptionClient"""
+    date: str
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: Any  # Decimal in newer ibapi releases
+
+
+class IvBar(NamedTuple):
+    """One underlying OPTION_IMPLIED_VOLATILITY bar (IV arrives in the close field)"""
+    date: str
+    implied_volatility: float
+
 
 class IBKROptionClient(EWrapper, EClient):
     """IBKR API client for fetching historical option data"""
@@ -46,10 +227,17 @@ class IBKROptionClient(EWrapper, EClient):
     def __init__(self, client_id: int = 124):
         EClient.__init__(self, self)
         self.client_id = client_id
-        self.data = []  # For TRADES data
-        self.iv_data = []  # For IMPLIED_VOLATILITY data
-        self.data_received = threading.Event()
-        self.iv_data_received = threading.Event()
+        self.data: List[PriceBar] = []  # For TRADES data
+        self.iv_data: List[IvBar] = []  # For IMPLIED_VOLATILITY data
+        # reqId -> (request tag, bar buffer) for the fetch in progress; replaced as a whole per fetch
+        # so a late callback for an old reqId finds nothing (or only the discarded old buffers)
+        self._requests: Dict[int, Tuple[str, list]] = {}
+        self._next_req_id = 0
+        # reqIds of the current fetch that have not ended yet
+        self._done_cond = threading.Condition()
+        self._pending: set = set()
+        # Set when the last fetch gave up waiting; owners discard the client rather than reuse it
+        self.last_fetch_timed_out = False
         self.connection_successful = threading.Event()
         self.error_occurred = False
         self.error_message = ""
@@ -65,35 +253,49 @@ class IBKROptionClient(EWrapper, EClient):
         if errorCode in [502, 504]:  # Connection errors
             self.error_occurred = True
             self.error_message = f"Connection error: {errorString}"
-        self.data_received.set()  # Unblock waiting threads
+            with self._done_cond:  # Unblock all waiting requests
+                self._pending.clear()
+                self._done_cond.notify_all()
+        else:
+            self._mark_done(reqId)  # Request failed, no historicalDataEnd will follow
+
+    def _mark_done(self, req_id: int):
+        """Flag a request of the current fetch as finished and wake the fetching thread"""
+        with self._done_cond:
+            if req_id in self._pending:  # Ignores stale and non-request (-1) ids
+                self._pending.discard(req_id)
+                self._done_cond.notify_all()
+
+    def _wait_done(self, timeout: float) -> bool:
+        """Block until every request of the current fetch has finished or timeout elapses"""
+        with self._done_cond:
+            return self._done_cond.wait_for(lambda: not self._pending, timeout=timeout)
 
     def historicalData(self, reqId: int, bar):
         """Receive historical data bars"""
-        if reqId == 0:  # TRADES data (price)
-            logger.info(f"Received price bar: reqId={reqId}, date={bar.date}, close={bar.close}")
-            self.data.append({
-                'date': bar.date,
-                'open': bar.open,
-                'high': bar.high,
-                'low': bar.low,
-                'close': bar.close,
-                'volume': bar.volume
-            })
-        elif reqId == 1:  # OPTION_IMPLIED_VOLATILITY data
-            logger.info(f"Received IV bar: reqId={reqId}, date={bar.date}, close={bar.close}")
-            self.iv_data.append({
-                'date': bar.date,
-                'implied_volatility': bar.close  # IV is returned in the close field
-            })
+        # Runs once per bar on the API reader thread: per-bar logging is DEBUG-only and lazily
+        # formatted, and buffers grow by plain append (pre-sizing them measured ~2x slower)
+        request = self._requests.get(reqId)
+        if request is None:
+            logger.debug("Dropping bar for stale reqId=%s, date=%s", reqId, bar.date)
+            return
+        tag, bars = request
+        if tag == TRADES_REQUEST:  # TRADES data (price)
+            logger.debug("Received price bar: reqId=%s, date=%s, close=%s", reqId, bar.date, bar.close)
+            # Interned so the TRADES and IV copies of a timestamp are one object and the date join
+            # compares them by identity instead of character by character
+            bars.append(PriceBar(sys.intern(bar.date), bar.open, bar.high, bar.low, bar.close, bar.volume))
+        else:  # OPTION_IMPLIED_VOLATILITY data
+            logger.debug("Received IV bar: reqId=%s, date=%s, close=%s", reqId, bar.date, bar.close)
+            bars.append(IvBar(sys.intern(bar.date), bar.close))  # IV is returned in the close field
 
     def historicalDataEnd(self, reqId: int, start: str, end: str):
         """Called when historical data request is complete"""
-        if reqId == 0:
-            logger.info(f"TRADES data request {reqId} completed. Received {len(self.data)} bars")
-            self.data_received.set()
-        elif reqId == 1:
-            logger.info(f"IV data request {reqId} completed. Received {len(self.iv_data)} bars")
-            self.iv_data_received.set()
+        request = self._requests.get(reqId)
+        if request is not None:
+            tag, bars = request
+            logger.info(f"{tag} data request {reqId} completed. Received {len(bars)} bars")
+        self._mark_done(reqId)
 
     def connect_to_ibkr(self, host: str = "127.0.0.1", port: int = 7496) -> bool:
         """Connect to IBKR TWS/Gateway"""
@@ -111,7 +313,11 @@ class IBKROptionClient(EWrapper, EClient):
         api_thread = threading.Thread(target=run_loop, daemon=True)
         api_thread.start()
 
-        time.sleep(1)  # Allow time for connection
+        # nextValidId sets connection_successful once the API handshake completes
+        if not self.connection_successful.wait(timeout=CONNECT_TIMEOUT_SECONDS):
+            logger.error(f"IBKR option client connect timed out after {CONNECT_TIMEOUT_SECONDS}s")
+            self.disconnect()
+            return False
         return True
 
     def fetch_option_data(
@@ -159,16 +365,23 @@ class IBKROptionClient(EWrapper, EClient):
             stock_contract.exchange = 'SMART'
             stock_contract.currency = 'USD'
 
-            # Initialize data storage
+            # Fresh request ids and buffers for this fetch; callbacks for earlier ids are dropped
+            trades_req_id, iv_req_id = self._next_req_id, self._next_req_id + 1
+            self._next_req_id += 2
             self.data = []
             self.iv_data = []
-            self.data_received.clear()
-            self.iv_data_received.clear()
+            self.last_fetch_timed_out = False
+            with self._done_cond:
+                self._pending = {trades_req_id, iv_req_id}
+            self._requests = {
+                trades_req_id: (TRADES_REQUEST, self.data),
+                iv_req_id: (IV_REQUEST, self.iv_data),
+            }
 
             # Request 1: Historical TRADES data (option prices)
             logger.info("Requesting option TRADES data...")
             self.reqHistoricalData(
-                0,  # reqId = 0 for TRADES
+                trades_req_id,
                 option_contract,
                 '',  # End date (empty = latest available)
                 period,
@@ -180,17 +393,11 @@ class IBKROptionClient(EWrapper, EClient):
                 []  # Chart options
             )
 
-            # Wait for TRADES data
-            self.data_received.wait(timeout=15)
-
-            logger.info(f"Option TRADES data received: {len(self.data)} bars")
-            if len(self.data) > 0:
-                logger.info(f"  TRADES date range: {self.data[0]['date']} to {self.data[-1]['date']}")
-
             # Request 2: Historical IV data from UNDERLYING STOCK
+            # Sent without waiting on TRADES so IBKR serves both requests concurrently
             logger.info(f"Requesting IV data from underlying {symbol} stock...")
             self.reqHistoricalData(
-                1,  # reqId = 1 for IV
+                iv_req_id,
                 stock_contract,  # STOCK contract, not option!
                 '',  # End date (empty = latest available)
                 period,
@@ -202,92 +409,64 @@ class IBKROptionClient(EWrapper, EClient):
                 []  # Chart options
             )
 
-            # Wait for IV data
-            self.iv_data_received.wait(timeout=15)
+            # Wait for both requests (callbacks are routed to self.data / self.iv_data by reqId)
+            if not self._wait_done(timeout=FETCH_TIMEOUT_SECONDS):
+                logger.warning(f"Timed out after {FETCH_TIMEOUT_SECONDS}s waiting for TRADES/IV data")
+                self.last_fetch_timed_out = True
+                with self._done_cond:
+                    unfinished, self._pending = self._pending, set()
+                for req_id in unfinished:
+                    self.cancelHistoricalData(req_id)
+
+            # Stop routing callbacks into this fetch's buffers
+            self._requests = {}
+
+            logger.info(f"Option TRADES data received: {len(self.data)} bars")
+            if len(self.data) > 0:
+                logger.info(f"  TRADES date range: {self.data[0].date} to {self.data[-1].date}")
 
             logger.info(f"Underlying IV data received: {len(self.iv_data)} bars")
             if len(self.iv_data) > 0:
-                logger.info(f"  IV date range: {self.iv_data[0]['date']} to {self.iv_data[-1]['date']}")
+                logger.info(f"  IV date range: {self.iv_data[0].date} to {self.iv_data[-1].date}")
 
             # CRITICAL FIX: Filter option TRADES to only include bars with matching IV data
             # This removes ALL settlement bars (16:00 regular days, 13:00 half-days, etc.)
             # Settlement bars are NOT real trading data - they're price snapshots
             # Characteristics: Open=High=Low=Close, Volume=0 or near-zero
             # See: OPTION_DATA_CLOSURE_SETTLEMENT_ISSUE.md for full explanation
-            iv_dates = set(bar['date'] for bar in self.iv_data)
-            original_count = len(self.data)
-            self.data = [bar for bar in self.data if bar['date'] in iv_dates]
-            filtered_count = original_count - len(self.data)
+            # The inner merge on date applies this filter and attaches IV in one pass
+            merged_df = self._merge_price_and_iv_data(self.data, self.iv_data)
+            filtered_count = len(self.data) - len(merged_df)
 
             if filtered_count > 0:
                 logger.info(f"  Filtered out {filtered_count} settlement bars (not in IV data)")
 
-            if len(self.data) > 0:
-                logger.info(f"  TRADES after settlement filter: {len(self.data)} bars ({self.data[0]['date']} to {self.data[-1]['date']})")
+            if len(merged_df) > 0:
+                logger.info(f"  TRADES after settlement filter: {len(merged_df)} bars "
+                            f"({merged_df['date'].iat[0]} to {merged_df['date'].iat[-1]})")
 
-            # Log the mismatch with detailed comparison
-            if len(self.data) != len(self.iv_data):
-                logger.warning(f"  ⚠️  BAR COUNT MISMATCH: TRADES={len(self.data)} bars, IV={len(self.iv_data)} bars (diff={len(self.data)-len(self.iv_data)})")
+            # Log the mismatch; the detailed comparison is only built when DEBUG is enabled
+            if len(merged_df) != len(self.iv_data):
+                logger.warning(f"  ⚠️  BAR COUNT MISMATCH: TRADES={len(merged_df)} bars, IV={len(self.iv_data)} bars (diff={len(merged_df)-len(self.iv_data)})")
                 logger.warning(f"  This will result in some bars having NULL IV values")
 
-                # Print detailed comparison
-                print("\n" + "="*80)
-                print("DETAILED BAR COMPARISON - TRADES vs IV")
-                print("="*80)
-
-                # First 5 bars
-                print("\n--- FIRST 5 BARS ---")
-                print("\nTRADES (Option Contract):")
-                for i, bar in enumerate(self.data[:5]):
-                    print(f"  {i+1}. {bar['date']} - Close: ${bar['close']:.2f}")
-
-                print("\nIV (Stock Contract):")
-                for i, bar in enumerate(self.iv_data[:5]):
-                    print(f"  {i+1}. {bar['date']} - IV: {bar['implied_volatility']:.4f}")
-
-                # Last 5 bars
-                print("\n--- LAST 5 BARS ---")
-                print("\nTRADES (Option Contract):")
-                for i, bar in enumerate(self.data[-5:]):
-                    print(f"  {len(self.data)-4+i}. {bar['date']} - Close: ${bar['close']:.2f}")
-
-                print("\nIV (Stock Contract):")
-                for i, bar in enumerate(self.iv_data[-5:]):
-                    print(f"  {len(self.iv_data)-4+i}. {bar['date']} - IV: {bar['implied_volatility']:.4f}")
-
-                # Date range comparison
-                print("\n--- DATE RANGE COMPARISON ---")
-                print(f"TRADES: {self.data[0]['date']} to {self.data[-1]['date']} ({len(self.data)} bars)")
-                print(f"IV:     {self.iv_data[0]['date']} to {self.iv_data[-1]['date']} ({len(self.iv_data)} bars)")
-
-                # Check for gaps
-                trades_dates = set(bar['date'] for bar in self.data)
-                iv_dates = set(bar['date'] for bar in self.iv_data)
-
-                only_in_trades = trades_dates - iv_dates
-                only_in_iv = iv_dates - trades_dates
-
-                if only_in_trades:
-                    print(f"\n--- DATES ONLY IN TRADES ({len(only_in_trades)} bars) ---")
-                    for date in sorted(only_in_trades)[:10]:  # Show first 10
-                        print(f"  {date}")
-                    if len(only_in_trades) > 10:
-                        print(f"  ... and {len(only_in_trades)-10} more")
-
-                if only_in_iv:
-                    print(f"\n--- DATES ONLY IN IV ({len(only_in_iv)} bars) ---")
-                    for date in sorted(only_in_iv)[:10]:  # Show first 10
-                        print(f"  {date}")
-                    if len(only_in_iv) > 10:
-                        print(f"  ... and {len(only_in_iv)-10} more")
-
-                print("="*80 + "\n")
-
-            if len(self.data) < 1:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(self._format_bar_comparison(merged_df, self.iv_data))
+
+            if len(merged_df) < 1:
                 raise Exception(f'Failed loading option price data for {symbol} {strike}{right}. Try again.')
 
-            # Merge IV data with price data
-            merged_data = self._merge_price_and_iv_data(self.data, self.iv_data)
+            bars_with_iv = int(merged_df['implied_volatility'].notna().sum())
+            logger.info(f"IV merge: {len(merged_df)} total bars, {bars_with_iv} with IV "
+                        f"({bars_with_iv/len(merged_df)*100:.1f}%)")
+
+            # Callers (save paths, fetch_many) still consume a list of bar dicts. Zipping the
+            # column lists builds each dict from one literal tuple, ~5x faster than to_dict('records')
+            columns = list(merged_df.columns)
+            merged_data = [
+                dict(zip(columns, row))
+                for row in zip(*(merged_df[col].tolist() for col in columns))
+            ]
 
             logger.info(f'Finished loading option data with IV for {symbol} {strike}{right}')
             return merged_data
@@ -296,44 +475,75 @@ class IBKROptionClient(EWrapper, EClient):
             logger.error(f"Error fetching option data: {str(e)}")
             raise
 
-    def _merge_price_and_iv_data(self, price_data: List[Dict], iv_data: List[Dict]) -> List[Dict]:
+    @staticmethod
+    def _format_bar_comparison(merged_df: pd.DataFrame, iv_data: List[IvBar], limit: int = 10) -> str:
         """
-        Merge price and IV data on date (should be 1:1 match after 16:00 filter)
+        Build the TRADES vs IV comparison report logged on a bar count mismatch
 
         Args:
-            price_data: List of price bars (16:00 settlement bars already filtered out)
+            merged_df: TRADES bars left after the settlement filter
             iv_data: List of IV bars
+            limit: Maximum number of unmatched dates listed per side
 
         Returns:
-            List of merged bars with IV included
+            Multi-line report string
         """
-        # Create dict for fast IV lookup by date
-        iv_dict = {bar['date']: bar['implied_volatility'] for bar in iv_data}
-
-        # Merge IV into price data (should be exact 1:1 match)
-        merged = []
-
-        for price_bar in price_data:
-            bar_date = price_bar['date']
-            merged_bar = price_bar.copy()
-
-            # Get IV for this bar
-            merged_bar['implied_volatility'] = iv_dict.get(bar_date, None)
-
-            merged.append(merged_bar)
+        lines = ["", "=" * 80, "DETAILED BAR COMPARISON - TRADES vs IV", "=" * 80]
+
+        # First and last 5 bars of each series
+        for label, trades, ivs, offset in (
+            ("FIRST 5 BARS", merged_df.head(5), iv_data[:5], 1),
+            ("LAST 5 BARS", merged_df.tail(5), iv_data[-5:], None),
+        ):
+            lines.append(f"--- {label} ---")
+            lines.append("TRADES (Option Contract):")
+            start = offset or len(merged_df) - 4
+            for i, bar in enumerate(trades.itertuples(index=False)):
+                lines.append(f"  {start+i}. {bar.date} - Close: ${bar.close:.2f}")
+            lines.append("IV (Stock Contract):")
+            start = offset or len(iv_data) - 4
+            for i, bar in enumerate(ivs):
+                lines.append(f"  {start+i}. {bar.date} - IV: {bar.implied_volatility:.4f}")
+
+        # Date range comparison
+        if len(merged_df) > 0 and iv_data:
+            lines.append("--- DATE RANGE COMPARISON ---")
+            lines.append(f"TRADES: {merged_df['date'].iat[0]} to {merged_df['date'].iat[-1]} ({len(merged_df)} bars)")
+            lines.append(f"IV:     {iv_data[0].date} to {iv_data[-1].date} ({len(iv_data)} bars)")
+
+        # Check for gaps. The inner join already dropped every TRADES date missing from IV, so only
+        # IV-side gaps can exist; nsmallest picks the earliest without sorting the whole set
+        trades_dates = set(merged_df['date'])
+        only_in_iv = {bar.date for bar in iv_data if bar.date not in trades_dates}
+
+        if only_in_iv:
+            lines.append(f"--- DATES ONLY IN IV ({len(only_in_iv)} bars) ---")
+            lines.extend(f"  {date}" for date in heapq.nsmallest(limit, only_in_iv))
+            if len(only_in_iv) > limit:
+                lines.append(f"  ... and {len(only_in_iv)-limit} more")
+
+        lines.append("=" * 80)
+        return "\n".join(lines)
+
+    def _merge_price_and_iv_data(self, price_data: List[PriceBar], iv_data: List[IvBar]) -> pd.DataFrame:
+        """
+        Inner-join price and IV bars on date, dropping price bars without IV (settlement bars)
 
-        # Log statistics
-        total_bars = len(merged)
-        bars_with_iv = sum(1 for bar in merged if bar['implied_volatility'] is not None)
-        bars_without_iv = total_bars - bars_with_iv
+        Args:
+            price_data: List of TRADES bars
+            iv_data: List of IV bars
 
-        logger.info(f"IV merge: {total_bars} total bars, {bars_with_iv} with IV ({bars_with_iv/total_bars*100:.1f}%)")
+        Returns:
+            DataFrame of price bars with an implied_volatility column, in TRADES order
+        """
+        # Bars are tuples, so the frames are built positionally without per-row dict lookups
+        price_df = pd.DataFrame(price_data, columns=PriceBar._fields)
+        iv_df = pd.DataFrame(iv_data, columns=IvBar._fields)
 
-        if bars_without_iv > 0:
-            logger.warning(f"  ⚠️  {bars_without_iv} bars missing IV - this should not happen after 16:00 filter!")
-            logger.warning(f"  Check if 16:00 settlement filter is working correctly")
+        # Last IV bar wins on a duplicate date, matching the former dict lookup
+        iv_df = iv_df.drop_duplicates(subset='date', keep='last')
 
-        return merged
+        return price_df.merge(iv_df, on='date', how='inner')
 
     def disconnect_from_ibkr(self):
         """Disconnect from IBKR"""
@@ -348,15 +558,44 @@ class IBKROptionService:
     """Service for managing IBKR option data fetching and database storage"""
 
     def __init__(self):
-        self.client = None
-
+        self._client: Optional[IBKROptionClient] = None
+        # Re-entrant so get_option_data can hold it across a fetch on the shared client
+        self._client_lock = threading.RLock()
+        self._client_pool = None
+        self._client_pool_size = 0
+        self._client_pool_lock = threading.Lock()
+        # LRU of get_option_data_from_db frames keyed by _contract_cache_key(...) + (start, end)
+        self._query_cache: OrderedDict = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+
+    @staticmethod
+    def _contract_cache_key(symbol: str, strike: float, right: str, expiration, bar_interval: str) -> Tuple:
+        """Normalize a contract + interval so string and date expirations share cache entries"""
+        if not isinstance(expiration, str):
+            expiration = expiration.strftime('%Y%m%d')
+        return (symbol, float(strike), right, expiration, bar_interval)
+
+    def _invalidate_query_cache(self, symbol: str, strike: float, right: str, expiration, bar_interval: str):
+        """Drop cached query results for a contract whose bars were just written"""
+        prefix = self._contract_cache_key(symbol, strike, right, expiration, bar_interval)
+        with self._query_cache_lock:
+            for key in [key for key in self._query_cache if key[:5] == prefix]:
+                del self._query_cache[key]
+
+    @contextmanager
     def get_db_connection(self):
-        """Get database connection"""
+        """Borrow a pooled database connection for the duration of a with block"""
         try:
-            return psycopg2.connect(**{k: v for k, v in DB_CONFIG.items() if v is not None})
+            pool = _get_db_pool()
+            conn = pool.getconn()
         except Exception as e:
             logger.error(f"Database connection error: {str(e)}")
             raise
+        try:
+            yield conn
+        finally:
+            # The pool rolls back any open transaction; drop connections the server has closed
+            pool.putconn(conn, close=bool(conn.closed))
 
     def save_option_data_to_db(
         self,
@@ -378,65 +617,326 @@ class IBKROptionService:
             data: List of bar data dictionaries
             bar_interval: Bar interval (e.g., '30 mins', '1 day')
         """
-        if not data:
-            return
+        self.save_many_option_chains([{
+            'symbol': symbol,
+            'strike': strike,
+            'right': right,
+            'expiration': expiration,
+            'data': data,
+            'bar_interval': bar_interval,
+        }])
+
+    def save_many_option_chains(self, payloads: List[Dict]):
+        """
+        Save several contracts' bars to options_data in a single transaction (one COMMIT)
 
-        conn = self.get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                # Convert expiration to date object if string
-                if isinstance(expiration, str):
-                    exp_date = datetime.strptime(expiration, '%Y%m%d').date()
-                else:
-                    exp_date = expiration
+        Args:
+            payloads: List of dicts with symbol, strike, right, expiration (YYYYMMDD string or
+                      date object), data (list of bar dicts) and optionally bar_interval
+        """
+        payloads = [payload for payload in payloads if payload['data']]
+        if not payloads:
+            return
 
-                for bar in data:
-                    # Parse date from IBKR format (handle double space for intraday)
-                    date_str = bar['date'].strip()
+        # Full-history imports: COPY into the staging table beats formatting every row as SQL
+        if sum(len(payload['data']) for payload in payloads) > COPY_SAVE_THRESHOLD_ROWS:
+            self.bulk_save_option_data([
+                ((payload['symbol'], payload['strike'], payload['right'], payload['expiration'],
+                  payload.get('bar_interval', '30 mins')), payload['data'])
+                for payload in payloads
+            ])
+            return
 
-                    try:
-                        if ' ' in date_str:
-                            # Intraday: "20240101  09:30:00" (double space!)
-                            date_str_normalized = ' '.join(date_str.split())
-                            date_obj = datetime.strptime(date_str_normalized, '%Y%m%d %H:%M:%S')
+        with self.get_db_connection() as conn:
+            try:
+                _ensure_upsert_prepared(conn)
+                with conn.cursor() as cursor:
+                    # Build rows keyed on contract + bar timestamp - IBKR can repeat a timestamp around
+                    # the close, and ON CONFLICT cannot update the same row twice in one statement
+                    rows_by_key = {}
+                    saved_contracts = []
+                    for payload in payloads:
+                        # Convert expiration to date object if string
+                        expiration = payload['expiration']
+                        if isinstance(expiration, str):
+                            exp_date = datetime.strptime(expiration, '%Y%m%d').date()
                         else:
-                            # Daily: "20240101"
-                            date_obj = datetime.strptime(date_str, '%Y%m%d')
-                    except ValueError as e:
-                        logger.error(f"Could not parse date: '{date_str}' - Error: {e}")
-                        continue
+                            exp_date = expiration
+                        bar_interval = payload.get('bar_interval', '30 mins')
+
+                        # The contract key and interval are the same for every row, so pack them once
+                        const_prefix = (payload['symbol'], payload['strike'], payload['right'], exp_date)
+                        const_suffix = (bar_interval,)
+                        data = payload['data']
+                        parsed_dates = _parse_bar_dates([bar['date'] for bar in data]).to_pydatetime()
+                        for bar, date_obj in zip(data, parsed_dates):
+                            if date_obj is pd.NaT:
+                                continue
+
+                            rows_by_key[(const_prefix, date_obj, bar_interval)] = (
+                                *const_prefix, date_obj,
+                                bar['open'], bar['high'], bar['low'], bar['close'], bar['volume'],
+                                bar.get('implied_volatility'),  # NEW: IV column
+                                *const_suffix
+                            )
+                        saved_contracts.append((*const_prefix, bar_interval))
+
+                    rows = list(rows_by_key.values())
 
                     # Insert with ON CONFLICT to handle duplicates
-                    cursor.execute("""
+                    if 0 < len(rows) < SMALL_BATCH_ROWS:
+                        # Typical 1-month fetch: one EXECUTE of the prepared upsert, rows passed column-wise
+                        cursor.execute(_OPTION_EXECUTE_SQL, [list(column) for column in zip(*rows)])
+                    elif rows:
+                        execute_values(
+                            cursor,
+                            _OPTION_INSERT_SQL + "%s" + _OPTION_ON_CONFLICT_SQL,
+                            rows,
+                            template=_OPTION_ROW_TEMPLATE,
+                            page_size=EXECUTE_VALUES_PAGE_SIZE
+                        )
+
+                    conn.commit()
+                    for contract in saved_contracts:
+                        self._invalidate_query_cache(*contract)
+
+                    if len(saved_contracts) == 1:
+                        symbol, strike, right, exp_date, bar_interval = saved_contracts[0]
+                        logger.info(f"Saved {len(rows)} option bars to DB: {symbol} {strike}{right} exp={exp_date} interval={bar_interval}")
+                    else:
+                        logger.info(f"Saved {len(rows)} option bars to DB for {len(saved_contracts)} contracts")
+
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Error saving option data to DB: {str(e)}")
+                raise
+
+    def bulk_save_option_data(self, batches: List[Tuple[Tuple, List[Dict]]]):
+        """
+        Bulk-save many option contracts through an UNLOGGED staging table
+
+        Intended for historical backfills across many expirations/strikes. Rows
+        are COPY'd into the staging table (no WAL), then merged into options_data
+        with a single sorted INSERT ... ON CONFLICT so the unique index sees keys
+        in order, instead of one transaction per contract.
+
+        Args:
+            batches: List of ((symbol, strike, right, expiration, bar_interval), data)
+                     pairs, where data is a list of bar data dictionaries
+        """
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        row_count = 0
+
+        for (symbol, strike, right, expiration, bar_interval), data in batches:
+            if isinstance(expiration, str):
+                exp_date = datetime.strptime(expiration, '%Y%m%d').date()
+            else:
+                exp_date = expiration
+
+            parsed_dates = _parse_bar_dates([bar['date'] for bar in data]).to_pydatetime()
+            for bar, date_obj in zip(data, parsed_dates):
+                if date_obj is pd.NaT:
+                    continue
+
+                iv = bar.get('implied_volatility')
+                writer.writerow((
+                    symbol, strike, right, exp_date, date_obj,
+                    bar['open'], bar['high'], bar['low'], bar['close'], bar['volume'],
+                    '' if iv is None else iv,  # Unquoted empty field is NULL in CSV COPY
+                    bar_interval,
+                    row_count  # Input order, so duplicate bars resolve to the last one like save_many_option_chains
+                ))
+                row_count += 1
+
+        if row_count == 0:
+            return
+
+        buf.seek(0)
+        with self.get_db_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(f"""
+                        CREATE UNLOGGED TABLE IF NOT EXISTS {OPTION_STAGE_TABLE} (
+                            symbol VARCHAR(10),
+                            strike DECIMAL(10, 2),
+                            "right" CHAR(1),
+                            expiration DATE,
+                            date TIMESTAMP,
+                            "open" DECIMAL(10, 4),
+                            high DECIMAL(10, 4),
+                            low DECIMAL(10, 4),
+                            "close" DECIMAL(10, 4),
+                            volume BIGINT,
+                            implied_volatility DECIMAL(10, 6),
+                            bar_interval VARCHAR(20),
+                            ordinal BIGINT
+                        )
+                    """)
+
+                    # TRUNCATE takes an exclusive lock until commit, serializing concurrent backfills
+                    cursor.execute(f"TRUNCATE {OPTION_STAGE_TABLE}")
+
+                    cursor.copy_expert(f"""
+                        COPY {OPTION_STAGE_TABLE}
+                            (symbol, strike, "right", expiration, date, "open", high, low, "close", volume,
+                             implied_volatility, bar_interval, ordinal)
+                        FROM STDIN WITH (FORMAT csv)
+                    """, buf)
+
+                    # DISTINCT ON drops duplicate bars (ON CONFLICT cannot touch a row twice), keeping
+                    # the last one by ordinal; ORDER BY feeds the unique index sequential keys
+                    cursor.execute(f"""
                         INSERT INTO options_data
                             (symbol, strike, "right", expiration, date, "open", high, low, "close", volume,
                              implied_volatility, bar_interval)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (symbol, strike, "right", expiration, date, bar_interval)
-                        DO UPDATE SET
-                            "open" = EXCLUDED."open",
-                            high = EXCLUDED.high,
-                            low = EXCLUDED.low,
-                            "close" = EXCLUDED."close",
-                            volume = EXCLUDED.volume,
-                            implied_volatility = EXCLUDED.implied_volatility,
-                            updated_at = CURRENT_TIMESTAMP
-                    """, (
-                        symbol, strike, right, exp_date, date_obj,
-                        bar['open'], bar['high'], bar['low'], bar['close'], bar['volume'],
-                        bar.get('implied_volatility'),  # NEW: IV column
-                        bar_interval
-                    ))
-
-                conn.commit()
-                logger.info(f"Saved {len(data)} option bars to DB: {symbol} {strike}{right} exp={exp_date} interval={bar_interval}")
+                        SELECT DISTINCT ON (symbol, strike, "right", expiration, date, bar_interval)
+                            symbol, strike, "right", expiration, date, "open", high, low, "close", volume,
+                            implied_volatility, bar_interval
+                        FROM {OPTION_STAGE_TABLE}
+                        ORDER BY symbol, strike, "right", expiration, date, bar_interval, ordinal DESC
+                    """ + _OPTION_ON_CONFLICT_SQL)
+
+                    cursor.execute(f"TRUNCATE {OPTION_STAGE_TABLE}")
+
+                    conn.commit()
+                    for key, _ in batches:
+                        self._invalidate_query_cache(*key)
+                    logger.info(f"Bulk saved {row_count} option bars for {len(batches)} contracts via {OPTION_STAGE_TABLE}")
+
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Error bulk saving option data to DB: {str(e)}")
+                raise
+
+    def _get_client(self) -> IBKROptionClient:
+        """Return the persistent single-fetch client, reconnecting only if it has dropped"""
+        with self._client_lock:
+            if self._client is not None and self._client.isConnected():
+                return self._client
+
+            client = IBKROptionClient(IBKR_CONFIG["client_id"])
+            if not client.connect_to_ibkr(IBKR_CONFIG["host"], IBKR_CONFIG["port"]):
+                raise Exception("Failed to connect to IBKR")
+            self._client = client
+            return client
+
+    def _discard_client(self):
+        """Disconnect and drop the persistent client so the next fetch starts on a fresh connection"""
+        with self._client_lock:
+            if self._client is not None:
+                self._client.disconnect_from_ibkr()
+                self._client = None
+
+    def close(self):
+        """Disconnect the persistent client and any pooled clients"""
+        self._discard_client()
+        self.close_client_pool()
+
+    def _get_client_pool(self) -> queue.Queue:
+        """Lazily connect the pool of persistent clients used by fetch_many"""
+        with self._client_pool_lock:
+            if self._client_pool is None:
+                pool = queue.Queue()
+                for i in range(OPTION_CLIENT_POOL_SIZE):
+                    # Offset past the single-fetch client_id so both can be connected at once
+                    client = IBKROptionClient(IBKR_CONFIG["client_id"] + 1 + i)
+                    if client.connect_to_ibkr(IBKR_CONFIG["host"], IBKR_CONFIG["port"]):
+                        pool.put(client)
+                    else:
+                        logger.warning(f"Could not connect pooled option client {client.client_id}")
+
+                if pool.empty():
+                    raise Exception("Failed to connect any pooled IBKR option clients")
+
+                self._client_pool = pool
+                self._client_pool_size = pool.qsize()
+                logger.info(f"Connected {self._client_pool_size} pooled IBKR option clients")
+
+            return self._client_pool
+
+    def _checkout_pooled_client(self, pool: queue.Queue) -> IBKROptionClient:
+        """
+        Take a client from the pool, replacing it with a fresh connection if its socket has dropped
 
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Error saving option data to DB: {str(e)}")
-            raise
-        finally:
-            conn.close()
+        The pool slot is always kept: if reconnecting fails, the dead client goes back into the
+        queue (the next checkout retries) and this raises, so waiting workers never starve.
+        """
+        client = pool.get()
+        if client.isConnected():
+            return client
+
+        logger.warning(f"Pooled option client {client.client_id} is disconnected, reconnecting")
+        client.disconnect_from_ibkr()
+        fresh = IBKROptionClient(client.client_id)
+        if not fresh.connect_to_ibkr(IBKR_CONFIG["host"], IBKR_CONFIG["port"]):
+            pool.put(fresh)
+            raise Exception(f"Failed to reconnect pooled option client {client.client_id}")
+        return fresh
+
+    def close_client_pool(self):
+        """Disconnect all pooled clients created by fetch_many"""
+        with self._client_pool_lock:
+            if self._client_pool is None:
+                return
+            while not self._client_pool.empty():
+                self._client_pool.get_nowait().disconnect_from_ibkr()
+            self._client_pool = None
+            self._client_pool_size = 0
+
+    def fetch_many(self, specs: List[Dict], save: bool = True) -> List[Optional[List[Dict]]]:
+        """
+        Fetch many option contracts concurrently over a pool of persistent IBKR clients
+
+        Args:
+            specs: List of fetch_option_data keyword dicts
+                   (symbol, strike, right, expiration, and optionally period, bar_size)
+            save: Bulk-save all fetched contracts in one transaction once every fetch completes
+
+        Returns:
+            List of merged bar lists in the same order as specs (None for failed contracts)
+        """
+        if not specs:
+            return []
+
+        pool = self._get_client_pool()
+
+        def fetch(spec):
+            client = self._checkout_pooled_client(pool)
+            discard = True
+            try:
+                data = client.fetch_option_data(**spec)
+                discard = client.last_fetch_timed_out
+                return data
+            finally:
+                # A failed or timed-out fetch may still have requests in flight: disconnect so the
+                # next checkout replaces the client instead of reusing it
+                if discard:
+                    client.disconnect_from_ibkr()
+                pool.put(client)
+
+        results = []
+        with ThreadPoolExecutor(max_workers=self._client_pool_size) as executor:
+            futures = [executor.submit(fetch, spec) for spec in specs]
+            for spec, future in zip(specs, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Failed to fetch {spec['symbol']} {spec['strike']}{spec['right']} "
+                                 f"exp={spec['expiration']}: {str(e)}")
+                    results.append(None)
+
+        if save:
+            # DB writes happen here in the calling thread, after all IBKR waits have overlapped
+            batches = [
+                ((spec['symbol'], spec['strike'], spec['right'], spec['expiration'],
+                  spec.get('bar_size', '30 mins')), data)
+                for spec, data in zip(specs, results) if data
+            ]
+            if batches:
+                self.bulk_save_option_data(batches)
+
+        return results
 
     def get_option_data_from_db(
         self,
@@ -463,68 +963,86 @@ class IBKROptionService:
         Returns:
             pd.DataFrame with date index and OHLCV columns
         """
-        conn = self.get_db_connection()
-        try:
-            # Convert expiration to date
-            if isinstance(expiration, str):
-                exp_date = datetime.strptime(expiration, '%Y%m%d').date()
-            else:
-                exp_date = expiration
-
-            # Debug logging
-            log_file = os.path.join(os.path.dirname(__file__), "cache_debug.log")
-            with open(log_file, "a") as f:
-                f.write(f"  Querying DB with:\n")
-                f.write(f"    symbol={symbol}, strike={strike}, right={right}\n")
-                f.write(f"    expiration={exp_date} (type={type(exp_date).__name__})\n")
-                f.write(f"    date range={start_date} to {end_date}\n")
-                f.write(f"    bar_interval={bar_interval}\n")
-
-            query = """
-                SELECT date, "open" as open, high, low, "close" as close, volume, implied_volatility
-                FROM options_data
-                WHERE symbol = %s
-                    AND strike = %s
-                    AND "right" = %s
-                    AND expiration = %s
-                    AND date >= %s
-                    AND date <= %s
-                    AND bar_interval = %s
-                ORDER BY date
-            """
-
-            df = pd.read_sql_query(
-                query,
-                conn,
-                params=(symbol, strike, right, exp_date, start_date, end_date, bar_interval)
-            )
-
-            with open(log_file, "a") as f:
-                f.write(f"  Query returned {len(df)} rows\n")
-
-            if not df.empty:
-                df['date'] = pd.to_datetime(df['date'])
-                df.set_index('date', inplace=True)
-                df.index.name = 'DateTime'  # Match expected column name
-
-                # Capitalize column names to match expected format
-                df.rename(columns={
-                    'open': 'Open',
-                    'high': 'High',
-                    'low': 'Low',
-                    'close': 'Close',
-                    'volume': 'Volume',
-                    'implied_volatility': 'ImpliedVolatility'
-                }, inplace=True)
-
-            logger.info(f"Retrieved {len(df)} option bars from DB: {symbol} {strike}{right} exp={exp_date}")
-            return df
+        cache_key = self._contract_cache_key(symbol, strike, right, expiration, bar_interval) + (
+            str(start_date), str(end_date)
+        )
+        with self._query_cache_lock:
+            cached = self._query_cache.get(cache_key)
+            if cached is not None:
+                self._query_cache.move_to_end(cache_key)
+        if cached is not None:
+            logger.debug("query cache hit: %s", cache_key)
+            return cached.copy()  # Callers may modify the frame; keep the cached one pristine
+
+        with self.get_db_connection() as conn:
+            try:
+                # Convert expiration to date
+                if isinstance(expiration, str):
+                    exp_date = datetime.strptime(expiration, '%Y%m%d').date()
+                else:
+                    exp_date = expiration
 
-        except Exception as e:
-            logger.error(f"Error retrieving option data from DB: {str(e)}")
-            return pd.DataFrame()
-        finally:
-            conn.close()
+                # Bind the range as DATE parameters rather than text literals
+                if isinstance(start_date, str):
+                    start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+                if isinstance(end_date, str):
+                    end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+
+                query = """
+                    SELECT date, "open" as open, high, low, "close" as close, volume, implied_volatility
+                    FROM options_data
+                    WHERE symbol = %s
+                        AND strike = %s
+                        AND "right" = %s
+                        AND expiration = %s
+                        AND date >= %s
+                        AND date <= %s
+                        AND bar_interval = %s
+                    ORDER BY date
+                """
+
+                # Named (server-side) cursor streams rows in OPTION_QUERY_ITERSIZE batches instead of
+                # buffering the whole result client-side, and from_records skips read_sql's inference pass
+                with conn.cursor(name='option_data_stream') as cursor:
+                    cursor.itersize = OPTION_QUERY_ITERSIZE
+                    psycopg2.extensions.register_type(_DECIMAL_TO_FLOAT, cursor)
+                    cursor.execute(query, (symbol, strike, right, exp_date, start_date, end_date, bar_interval))
+                    df = pd.DataFrame.from_records(
+                        list(cursor),
+                        columns=['date', *_OPTION_FRAME_DTYPES]
+                    ).astype(_OPTION_FRAME_DTYPES)
+
+                logger.debug("cache query: %s %s%s exp=%s range=%s..%s interval=%s rows=%d",
+                             symbol, strike, right, exp_date, start_date, end_date, bar_interval, len(df))
+
+                if not df.empty:
+                    # TIMESTAMP column arrives as datetime objects, so set_index yields a DatetimeIndex directly
+                    df.set_index('date', inplace=True)
+                    df.index.name = 'DateTime'  # Match expected column name
+
+                    # Capitalize column names to match expected format
+                    df.rename(columns={
+                        'open': 'Open',
+                        'high': 'High',
+                        'low': 'Low',
+                        'close': 'Close',
+                        'volume': 'Volume',
+                        'implied_volatility': 'ImpliedVolatility'
+                    }, inplace=True)
+
+                logger.info(f"Retrieved {len(df)} option bars from DB: {symbol} {strike}{right} exp={exp_date}")
+
+                # Only successful queries are cached; the error path below returns an uncached empty frame
+                with self._query_cache_lock:
+                    self._query_cache[cache_key] = df
+                    self._query_cache.move_to_end(cache_key)
+                    if len(self._query_cache) > OPTION_QUERY_CACHE_SIZE:
+                        self._query_cache.popitem(last=False)
+                return df.copy()
+
+            except Exception as e:
+                logger.error(f"Error retrieving option data from DB: {str(e)}")
+                return pd.DataFrame()
 
     def get_option_data(
         self,
@@ -551,15 +1069,6 @@ class IBKROptionService:
         Returns:
             pd.DataFrame with DateTime index and OHLCV columns
         """
-        # Log to file for debugging
-        import datetime
-        log_file = os.path.join(os.path.dirname(__file__), "cache_debug.log")
-        with open(log_file, "a") as f:
-            f.write(f"\n{'='*80}\n")
-            f.write(f"[{datetime.datetime.now()}] CACHE CHECK\n")
-            f.write(f"Request: {symbol} {strike}{right} exp={expiration}\n")
-            f.write(f"Range: {start_date} to {end_date}, interval={bar_interval}\n")
-
         print("\n" + "="*80)
         print(f"CHECKING DATABASE CACHE: {symbol} {strike}{right} exp={expiration}")
         print(f"Requested: {start_date} to {end_date}, interval={bar_interval}")
@@ -574,21 +1083,25 @@ class IBKROptionService:
             db_bars = len(df) if not df.empty else 0
             print(f"Database query returned: {db_bars} bars")
 
-            with open(log_file, "a") as f:
-                f.write(f"DB query returned: {db_bars} bars\n")
+            logger.debug("cache check: %s %s%s exp=%s range=%s..%s bars=%d",
+                         symbol, strike, right, expiration, start_date, end_date, db_bars)
 
             # Check if we have complete data coverage
             if not df.empty:
                 start_dt = pd.to_datetime(start_date)
                 end_dt = pd.to_datetime(end_date)
 
+                # Query is ORDER BY date, so the endpoints are the first/last index entries
+                db_start = df.index[0]
+                db_end = df.index[-1]
+
                 logger.info(f"✓ DB has {len(df)} bars in database")
-                logger.info(f"  DB coverage - Range: {df.index.min()} to {df.index.max()}")
+                logger.info(f"  DB coverage - Range: {db_start} to {db_end}")
                 logger.info(f"  Requested range: {start_dt} to {end_dt}")
 
                 # Check data coverage (allow DB to have extra data before/after)
-                start_gap_days = (df.index.min() - start_dt).days  # Negative if DB starts earlier (GOOD)
-                end_gap_days = (end_dt - df.index.max()).days      # Positive if DB ends earlier (need tolerance)
+                start_gap_days = (db_start - start_dt).days  # Negative if DB starts earlier (GOOD)
+                end_gap_days = (end_dt - db_end).days        # Positive if DB ends earlier (need tolerance)
 
                 logger.info(f"  Gap check - Start gap: {start_gap_days} days, End gap: {end_gap_days} days")
 
@@ -600,24 +1113,15 @@ class IBKROptionService:
                 # DB ending up to 5 days BEFORE requested is acceptable (positive gap <= 5)
                 end_ok = end_gap_days <= 5
 
-                with open(log_file, "a") as f:
-                    f.write(f"Coverage check: start_gap={start_gap_days}d, end_gap={end_gap_days}d\n")
-                    f.write(f"start_ok={start_ok}, end_ok={end_ok}\n")
-
                 if start_ok and end_ok:
                     logger.info(f"✓ Complete option data found in DB - USING CACHED DATA (no IBKR fetch)")
                     print(f"✓ Using cached data from database ({len(df)} bars) - No IBKR connection needed")
 
-                    with open(log_file, "a") as f:
-                        f.write(f"DECISION: USING CACHE (returning {len(df[start_dt:end_dt])} bars)\n")
-
-                    return df[start_dt:end_dt]
+                    # The DB query is already bounded by start_date/end_date, so no re-slice is needed
+                    return df
                 else:
                     logger.info(f"⚠️  DB data incomplete - gaps outside tolerance - WILL FETCH FROM IBKR")
                     print(f"⚠️  Database data incomplete (start_ok={start_ok}, end_ok={end_ok}, gaps: start={start_gap_days}d, end={end_gap_days}d)")
-
-                    with open(log_file, "a") as f:
-                        f.write(f"DECISION: FETCH FROM IBKR (gaps outside tolerance)\n")
             else:
                 logger.info(f"⚠️  No data in DB - WILL FETCH FROM IBKR")
                 print(f"⚠️  No cached data found - fetching from IBKR...")
@@ -638,19 +1142,25 @@ class IBKROptionService:
             else:
                 period = f"{days_diff // 30} M"
 
-            # Fetch from IBKR
-            self.client = IBKROptionClient(IBKR_CONFIG["client_id"])
-            if not self.client.connect_to_ibkr(IBKR_CONFIG["host"], IBKR_CONFIG["port"]):
-                raise Exception("Failed to connect to IBKR")
-
-            data = self.client.fetch_option_data(
-                symbol=symbol,
-                strike=strike,
-                right=right,
-                expiration=expiration,
-                period=period,
-                bar_size=bar_interval
-            )
+            # Fetch from IBKR over the persistent client (serialized, it holds per-request state).
+            # A client whose fetch failed or timed out may still have requests in flight, so it
+            # is discarded rather than reused
+            with self._client_lock:
+                client = self._get_client()
+                try:
+                    data = client.fetch_option_data(
+                        symbol=symbol,
+                        strike=strike,
+                        right=right,
+                        expiration=expiration,
+                        period=period,
+                        bar_size=bar_interval
+                    )
+                except Exception:
+                    self._discard_client()
+                    raise
+                if client.last_fetch_timed_out:
+                    self._discard_client()
 
             if data:
                 # Save to database
@@ -667,9 +1177,6 @@ class IBKROptionService:
         except Exception as e:
             logger.error(f"Error getting option data: {str(e)}")
             raise
-        finally:
-            if self.client:
-                self.client.disconnect_from_ibkr()
 
 
 # Global service instance
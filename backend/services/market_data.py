@@ -1,14 +1,27 @@
 """Unified Market Data Module - Database-first approach with IBKR fallback"""
 
 import logging
+import math
 import os
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union, Dict, Any, List
+from typing import Optional, Union, Dict, Any
 
 import numpy as np
 import pandas as pd
-from scipy.stats import norm
+
+try:
+    import bottleneck as bn  # Optional: C moving-window kernels for calculate_historical_volatility
+except ImportError:
+    bn = None
+
+try:
+    import numba  # Optional: JIT-compiles the scalar Black-Scholes path and the rolling-std fallback
+except ImportError:
+    numba = None
 
 # Add the current directory to Python path for imports
 current_dir = os.path.dirname(__file__)
@@ -19,6 +32,128 @@ from ibkr_data_service import ibkr_service
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# market_data column names -> names the strategies expect
+_COLUMN_RENAMES = {
+    'open': 'Open',
+    'high': 'High',
+    'low': 'Low',
+    'close': 'Close',
+    'volume': 'Volume',
+}
+
+# Troubleshooting message logged when market data cannot be loaded. %-style placeholders (symbol,
+# error) so logger.error only renders it when ERROR is enabled.
+_ERROR_RULE = '=' * 60
+_ERROR_TEMPLATE = (
+    "\n" + _ERROR_RULE + "\n"
+    "ERROR: Unable to load market data for %s\n"
+    + _ERROR_RULE + "\n"
+    "Please ensure that:\n"
+    "1. PostgreSQL database is running and accessible\n"
+    "2. TWS (Trader Workstation) or IB Gateway is running\n"
+    "3. TWS/Gateway has API access enabled:\n"
+    "   - Go to Configure → API → Settings\n"
+    "   - Check 'Enable ActiveX and Socket Clients'\n"
+    "   - Ensure correct port (7496 for TWS, 4002 for Gateway)\n"
+    "4. Market data subscriptions are active in your IBKR account\n"
+    "5. Your IBKR account has sufficient permissions for market data\n"
+    + _ERROR_RULE + "\n"
+    "To test the connection, try: GET /api/market-data/test-connection\n"
+    "Original error: %s"
+)
+
+# Frames assembled by load_data, shared by every MarketData instance in the process and keyed by
+# (symbol, start_date, end_date, bar_interval). Entries are never handed out directly - instances
+# get a copy, since strategies write into the tracking columns.
+LOAD_CACHE_SIZE = 32
+# Symbols whose bars load_data merges into SPY frames (VIX column, Dividend column)
+_MERGED_INTO_SPY = ("VIX", "SPY_DIV")
+_load_cache: OrderedDict = OrderedDict()
+_load_cache_lock = threading.Lock()
+
+
+# Set once create_market_data_table has succeeded in this process, so later instances skip the DDL
+_table_ready = False
+_table_ready_lock = threading.Lock()
+
+# Background worker for refresh_data, so a refresh never blocks the caller on the IBKR round-trip
+_refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="market-data-refresh")
+
+# IBKR history requests are sized from the requested start date: enough whole years to reach it
+# plus a margin, never less than the floor
+MIN_FETCH_YEARS = 5
+FETCH_YEARS_MARGIN = 2
+
+
+def _ensure_market_data_table():
+    """Create the market_data table once per process; a failed attempt is retried by the next caller"""
+    global _table_ready
+    if _table_ready:
+        return
+    with _table_ready_lock:
+        if _table_ready:
+            return
+        try:
+            ibkr_service.create_market_data_table()
+            _table_ready = True
+        except Exception as e:
+            logger.warning(f"Could not initialize database table: {e}")
+
+
+def _fetch_period(start_date: pd.Timestamp) -> str:
+    """IBKR duration string ('N Y') covering start_date through today in a single request"""
+    years_needed = (datetime.now() - start_date).days // 365 + FETCH_YEARS_MARGIN
+    return f"{max(MIN_FETCH_YEARS, years_needed)} Y"
+
+
+def _get_cached_load(symbol: str, start_date: pd.Timestamp, end_date: pd.Timestamp,
+                     bar_interval: str) -> Optional[pd.DataFrame]:
+    """Return a copy of the requested range from any cached load that covers it, or None"""
+    with _load_cache_lock:
+        for key, df in _load_cache.items():
+            cached_symbol, cached_start, cached_end, cached_interval = key
+            if (cached_symbol == symbol and cached_interval == bar_interval and
+                    cached_start <= start_date and end_date <= cached_end):
+                _load_cache.move_to_end(key)
+                # Sorted DatetimeIndex, so the label slice is a binary search
+                return df.loc[start_date:end_date].copy()
+    return None
+
+
+def _store_cached_load(symbol: str, start_date: pd.Timestamp, end_date: pd.Timestamp, bar_interval: str,
+                       df: pd.DataFrame):
+    """Keep a private copy of a freshly loaded frame, evicting the least recently used entry"""
+    with _load_cache_lock:
+        _load_cache[(symbol, start_date, end_date, bar_interval)] = df.copy()
+        if len(_load_cache) > LOAD_CACHE_SIZE:
+            _load_cache.popitem(last=False)
+
+
+def invalidate_cached_loads(symbol: str):
+    """Drop every cached load built from a symbol's bars (after its data is re-fetched)
+
+    VIX and SPY_DIV are merged into SPY frames, so re-fetching either also drops the SPY loads.
+    """
+    affected = {symbol, "SPY"} if symbol in _MERGED_INTO_SPY else {symbol}
+    with _load_cache_lock:
+        for key in [key for key in _load_cache if key[0] in affected]:
+            del _load_cache[key]
+
+
+def _fetch_and_invalidate(symbol: str, period: str) -> bool:
+    """Re-fetch a symbol from IBKR and, on success, drop its cached loads before the future completes"""
+    success = ibkr_service.fetch_and_store_data(symbol, period)
+    if success:
+        invalidate_cached_loads(symbol)
+    return success
+
+
+# Range a Volume column must fit in for load_data to store it as int32
+_INT32_MIN, _INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+# Zero-initialized tracking columns added by load_data (plus the string Trading_Log column)
+_TRACKING_FLOAT_COLUMNS = ['Portfolio_Value', 'Cash_Balance', 'Margin_Ratio', 'Premiums_Received', 'Interest_Paid']
+
 
 class MarketData:
     """Unified MarketData class that uses database-first approach with IBKR fallback"""
@@ -33,24 +168,44 @@ class MarketData:
         self.data = None
         self._data_loaded = False
         self._last_loaded_range = None
+        # Requested bounds of the loaded frame, so narrower ranges can be served from it
+        self._cached_start = None
+        self._cached_end = None
+
+        # Per-date lookup arrays for get_current_price / get_current_vix, rebuilt whenever self.data changes
+        self._lookup_source = None
+        self._idx = None
+        self._close = None
+        self._vix = None
+
+        # calculate_historical_volatility results by window, dropped whenever self.data changes
+        self._hv_source = None
+        self._hv_cache = {}
+
+        # Pending background refresh started by refresh_data, if any. Its callback runs on the
+        # executor thread, so it only raises _refresh_stale; the owning thread drops the loaded
+        # frame in _apply_refresh before its next read
+        self._refresh_future = None
+        self._refresh_stale = False
 
         # Initialize database table on first use
-        try:
-            ibkr_service.create_market_data_table()
-        except Exception as e:
-            logger.warning(f"Could not initialize database table: {e}")
+        _ensure_market_data_table()
 
-    def load_data(self, start_date: str = None, end_date: str = None, bar_interval: str = '1 day') -> pd.DataFrame:
+    def load_data(self, start_date: Optional[Union[str, pd.Timestamp]] = None,
+                  end_date: Optional[Union[str, pd.Timestamp]] = None,
+                  bar_interval: str = '1 day') -> pd.DataFrame:
         """Load market data using database-first approach with IBKR fallback
 
         Args:
-            start_date: Start date in 'YYYY-MM-DD' format (if None, loads from earliest available)
-            end_date: End date in 'YYYY-MM-DD' format (if None, loads to latest available)
+            start_date: Start date as 'YYYY-MM-DD' or Timestamp (if None, loads from earliest available)
+            end_date: End date as 'YYYY-MM-DD' or Timestamp (if None, loads to latest available)
             bar_interval: Bar interval (default: '1 day', can be '30 mins', '1 hour', etc.)
 
         Returns:
             pd.DataFrame: Market data with datetime index
         """
+        self._apply_refresh()
+
         # Convert None dates to reasonable defaults
         if start_date is None:
             # Default to 5 years ago instead of hardcoded 2015
@@ -63,43 +218,74 @@ class MarketData:
             end_date = yesterday.strftime("%Y-%m-%d")
             logger.info(f"No end_date provided, using default: {end_date}")
 
-        # Check if we already have data loaded for this range
+        # Parse once (a no-op for Timestamps): the range caches, _load_symbol_data and the DB
+        # queries all take these Timestamps, which psycopg2 adapts to SQL timestamps directly
+        start_date, end_date = pd.Timestamp(start_date), pd.Timestamp(end_date)
+
+        # Check if we already have data loaded for this range, or a wider one that contains it
         current_range = (start_date, end_date, bar_interval)
         if (self._data_loaded and
             self.data is not None and
-            self._last_loaded_range == current_range):
+            self._last_loaded_range[2] == bar_interval and
+            self._cached_start <= start_date and end_date <= self._cached_end):
+            if self._last_loaded_range != current_range:
+                # Narrow to the requested range - label slice on the sorted index, no DB round-trip
+                self.data = self.data.loc[start_date:end_date].copy()
+                self._last_loaded_range = current_range
+                self._cached_start, self._cached_end = start_date, end_date
             logger.info(f"Using cached data for {self.symbol} from {start_date} to {end_date}, interval={bar_interval}")
             return self.data
 
+        # Another instance (or an earlier, wider load) may already have assembled this range
+        cached_df = _get_cached_load(self.symbol, start_date, end_date, bar_interval)
+        if cached_df is not None and not cached_df.empty:
+            logger.info(f"Using process-wide cached data for {self.symbol} from {start_date} to {end_date}, interval={bar_interval}")
+            self.data = cached_df
+            self._data_loaded = True
+            self._last_loaded_range = current_range
+            self._cached_start, self._cached_end = start_date, end_date
+            return self.data
+
         logger.info(f"Loading market data for {self.symbol} from {start_date} to {end_date}, interval={bar_interval}")
 
         try:
-            # Load primary symbol data
-            primary_df = self._load_symbol_data(self.symbol, start_date, end_date, bar_interval)
+            # Cleared when VIX or dividends fall back to defaults, so a degraded frame is not
+            # shared with later instances through the process-wide cache
+            cacheable = True
+
+            # Load primary symbol data. For SPY the VIX load runs alongside it on a worker thread -
+            # both wait on the DB (or IBKR), so their round trips overlap instead of queueing.
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                vix_future = (executor.submit(self._load_symbol_data, "VIX", start_date, end_date, '1 day')
+                              if self.symbol == "SPY" else None)
+                primary_df = self._load_symbol_data(self.symbol, start_date, end_date, bar_interval)
 
             # For SPY strategies, also load VIX and dividend data
             if self.symbol == "SPY":
                 try:
-                    vix_df = self._load_symbol_data("VIX", start_date, end_date, '1 day')
+                    vix_df = vix_future.result()
 
                     # Merge SPY and VIX data
                     if not vix_df.empty:
-                        # Join VIX close prices as 'VIX' column
-                        primary_df = primary_df.join(vix_df['close'].rename('VIX'), how='left')
-                        # Fill any missing VIX values with forward fill
-                        primary_df['VIX'] = primary_df['VIX'].fillna(method='ffill')
-                        # Convert VIX to decimal if it's in percentage form
-                        if primary_df['VIX'].max() > 1.0:
-                            primary_df['VIX'] = primary_df['VIX'] / 100
+                        # Align VIX closes to the primary dates as 'VIX' column; method='ffill' carries
+                        # the last VIX close onto dates VIX lacks, in the same pass as the alignment
+                        vix = vix_df['close'].reindex(primary_df.index, method='ffill').to_numpy(dtype=np.float64)
+                        # Convert VIX to decimal if it's in percentage form - fmax.reduce skips NaN like
+                        # Series.max, and the divide reuses the aligned array instead of allocating
+                        if np.fmax.reduce(vix, initial=-np.inf) > 1.0:
+                            np.divide(vix, 100.0, out=vix)
+                        primary_df['VIX'] = vix
                         logger.info("Successfully merged VIX data with SPY")
                     else:
                         # Set default VIX if we can't load it
                         primary_df['VIX'] = 0.20  # 20% default volatility
+                        cacheable = False
                         logger.warning("Could not load VIX data, using default 20% volatility")
 
                 except Exception as e:
                     logger.warning(f"Error loading VIX data: {e}, using default volatility")
                     primary_df['VIX'] = 0.20  # 20% default volatility
+                    cacheable = False
 
                 # Load SPY dividend data via yfinance (DB-cached, refreshed when stale)
                 try:
@@ -109,8 +295,7 @@ class MarketData:
                     # Refresh if empty or stale (SPY pays quarterly, so >90 days gap means new dividend)
                     needs_refresh = div_df.empty
                     if not div_df.empty:
-                        end_dt = pd.to_datetime(end_date)
-                        days_since_last = (end_dt - div_df.index.max()).days
+                        days_since_last = (end_date - div_df.index[-1]).days  # rows are ORDER BY date
                         if days_since_last > 90:
                             logger.info(f"Dividend data stale ({days_since_last} days), re-fetching from Yahoo Finance")
                             needs_refresh = True
@@ -137,38 +322,40 @@ class MarketData:
                         logger.info(f"Merged {div_df.shape[0]} dividend payments into SPY data")
                     else:
                         primary_df['Dividend'] = 0.0
+                        cacheable = False
                         logger.warning("No dividend data available for SPY, dividends will not be applied")
                 except Exception as e:
                     logger.warning(f"Error loading SPY dividend data: {e}, dividends will not be applied")
                     primary_df['Dividend'] = 0.0
+                    cacheable = False
+
+            # Rename columns to match strategy expectations (missing keys are ignored). In place, since
+            # primary_df is a fresh frame from this load - rename() would otherwise copy every column.
+            primary_df.rename(columns=_COLUMN_RENAMES, inplace=True)
+
+            # Store Volume as int32 when every value fits (halves its bytes). Prices stay float64:
+            # float32 turns 450.12 into 450.1199951 and that error flows into strategy P&L.
+            if 'Volume' in primary_df.columns:
+                volume = primary_df['Volume']
+                if (volume.dtype.kind == 'i' and
+                        (volume.empty or (volume.min() >= _INT32_MIN and volume.max() <= _INT32_MAX))):
+                    primary_df['Volume'] = volume.astype(np.int32)
+
+            # Add required tracking columns for strategy compatibility, built as one block and
+            # concatenated once instead of six single-column inserts
+            tracking = pd.DataFrame(0.0, index=primary_df.index, columns=_TRACKING_FLOAT_COLUMNS)
+            tracking['Trading_Log'] = ''
+            primary_df = pd.concat([primary_df, tracking], axis=1, copy=False)
 
-            # Rename columns to match strategy expectations
-            if 'close' in primary_df.columns:
-                primary_df = primary_df.rename(columns={'close': 'Close'})
-            if 'open' in primary_df.columns:
-                primary_df = primary_df.rename(columns={'open': 'Open'})
-            if 'high' in primary_df.columns:
-                primary_df = primary_df.rename(columns={'high': 'High'})
-            if 'low' in primary_df.columns:
-                primary_df = primary_df.rename(columns={'low': 'Low'})
-            if 'volume' in primary_df.columns:
-                primary_df = primary_df.rename(columns={'volume': 'Volume'})
-
-            # Add required tracking columns for strategy compatibility
-            primary_df['Portfolio_Value'] = 0.0
-            primary_df['Cash_Balance'] = 0.0
-            primary_df['Margin_Ratio'] = 0.0
-            primary_df['Premiums_Received'] = 0.0
-            primary_df['Interest_Paid'] = 0.0
-            primary_df['Trading_Log'] = ''
-
-            # Ensure data is sorted by date
-            primary_df.sort_index(inplace=True)
+            # No sort needed: get_data_from_db returns rows ORDER BY date and VIX/dividends are aligned onto that index
 
             # Store data and mark as loaded
+            if cacheable:
+                _store_cached_load(self.symbol, start_date, end_date, bar_interval, primary_df)
             self.data = primary_df
             self._data_loaded = True
             self._last_loaded_range = current_range
+            self._cached_start, self._cached_end = start_date, end_date
 
             logger.info(f"Successfully loaded {len(primary_df)} records for {self.symbol}")
             logger.info(f"Date range: {primary_df.index[0]} to {primary_df.index[-1]}")
@@ -179,32 +366,17 @@ class MarketData:
             logger.error(f"Failed to load market data for {self.symbol}: {e}")
 
             # Provide detailed guidance for troubleshooting
-            error_msg = f"\n{'='*60}\n"
-            error_msg += f"ERROR: Unable to load market data for {self.symbol}\n"
-            error_msg += f"{'='*60}\n"
-            error_msg += f"Please ensure that:\n"
-            error_msg += f"1. PostgreSQL database is running and accessible\n"
-            error_msg += f"2. TWS (Trader Workstation) or IB Gateway is running\n"
-            error_msg += f"3. TWS/Gateway has API access enabled:\n"
-            error_msg += f"   - Go to Configure → API → Settings\n"
-            error_msg += f"   - Check 'Enable ActiveX and Socket Clients'\n"
-            error_msg += f"   - Ensure correct port (7496 for TWS, 4002 for Gateway)\n"
-            error_msg += f"4. Market data subscriptions are active in your IBKR account\n"
-            error_msg += f"5. Your IBKR account has sufficient permissions for market data\n"
-            error_msg += f"{'='*60}\n"
-            error_msg += f"To test the connection, try: GET /api/market-data/test-connection\n"
-            error_msg += f"Original error: {str(e)}"
-
-            print(error_msg)  # Also print to console for immediate visibility
+            logger.error(_ERROR_TEMPLATE, self.symbol, e)
             raise Exception(f"Market data loading failed. Please start TWS/Gateway and ensure API access is enabled. {str(e)}")
 
-    def _load_symbol_data(self, symbol: str, start_date: str, end_date: str, bar_interval: str = '1 day') -> pd.DataFrame:
+    def _load_symbol_data(self, symbol: str, start_date: pd.Timestamp, end_date: pd.Timestamp,
+                          bar_interval: str = '1 day') -> pd.DataFrame:
         """Load data for a specific symbol using database-first approach
 
         Args:
             symbol: Trading symbol
-            start_date: Start date in 'YYYY-MM-DD' format
-            end_date: End date in 'YYYY-MM-DD' format
+            start_date: Start date (already parsed by load_data)
+            end_date: End date (already parsed by load_data)
             bar_interval: Bar interval (default: '1 day')
 
         Returns:
@@ -219,44 +391,39 @@ class MarketData:
             if df.empty:
                 logger.info(f"No data found in database for {symbol}, fetching from IBKR")
 
-                # Fetch from IBKR and save to database - use longer period to ensure coverage
-                logger.info(f"Fetching 20 years of data for {symbol} with interval={bar_interval}")
-                if ibkr_service.fetch_and_store_data(symbol, "20 Y", bar_interval):
+                # Fetch from IBKR and save to database - one request sized to reach start_date
+                period = _fetch_period(start_date)
+                logger.info(f"Fetching {period} of data for {symbol} with interval={bar_interval}")
+                if ibkr_service.fetch_and_store_data(symbol, period, bar_interval):
                     # Try database again after IBKR fetch
                     df = ibkr_service.get_data_from_db(symbol, start_date, end_date, bar_interval)
 
                     if df.empty:
-                        # Try even longer period if still empty
-                        logger.info(f"Still no data, trying 25 years for {symbol}")
-                        if ibkr_service.fetch_and_store_data(symbol, "25 Y", bar_interval):
-                            df = ibkr_service.get_data_from_db(symbol, start_date, end_date, bar_interval)
-
-                        if df.empty:
-                            raise Exception(f"Still no data available for {symbol} after extended IBKR fetch")
+                        raise Exception(f"Still no data available for {symbol} after IBKR fetch of {period}")
                 else:
                     raise Exception(f"Failed to fetch data from IBKR for {symbol}")
 
             # Check data coverage
             if not df.empty:
-                start_dt = pd.to_datetime(start_date)
-                end_dt = pd.to_datetime(end_date)
+                # get_data_from_db orders by date, so the endpoints are the first and last rows
+                first_ts, last_ts = df.index[0], df.index[-1]
 
                 # Log coverage information
                 logger.info(f"Data coverage for {symbol}:")
                 logger.info(f"  Requested: {start_date} to {end_date}")
-                logger.info(f"  Available: {df.index.min().strftime('%Y-%m-%d')} to {df.index.max().strftime('%Y-%m-%d')}")
+                logger.info(f"  Available: {first_ts.strftime('%Y-%m-%d')} to {last_ts.strftime('%Y-%m-%d')}")
 
                 # Check if we have reasonable coverage (allow for weekends/holidays)
-                start_gap = (df.index.min() - start_dt).days
-                end_gap = (end_dt - df.index.max()).days
+                start_gap = (first_ts - start_date).days
+                end_gap = (end_date - last_ts).days
 
                 if start_gap > 10 or end_gap > 10:
                     logger.warning(f"Data gaps detected for {symbol}: start_gap={start_gap}, end_gap={end_gap}")
 
-                    # Try to fetch more data if gaps are significant
+                    # Try to fetch more data if gaps are significant, sized like the initial fetch
                     logger.info(f"Attempting to fetch additional data for {symbol}")
-                    if ibkr_service.fetch_and_store_data(symbol, "20 Y"):  # Fetch longer history
-                        df = ibkr_service.get_data_from_db(symbol, start_date, end_date)
+                    if ibkr_service.fetch_and_store_data(symbol, _fetch_period(start_date), bar_interval):
+                        df = ibkr_service.get_data_from_db(symbol, start_date, end_date, bar_interval)
                         logger.info(f"After additional fetch: {len(df)} records available")
 
             return df
@@ -265,37 +432,69 @@ class MarketData:
             logger.error(f"Error loading data for {symbol}: {e}")
 
             # Provide detailed guidance for troubleshooting
-            error_msg = f"\n{'='*60}\n"
-            error_msg += f"ERROR: Unable to load market data for {symbol}\n"
-            error_msg += f"{'='*60}\n"
-            error_msg += f"Please ensure that:\n"
-            error_msg += f"1. PostgreSQL database is running and accessible\n"
-            error_msg += f"2. TWS (Trader Workstation) or IB Gateway is running\n"
-            error_msg += f"3. TWS/Gateway has API access enabled:\n"
-            error_msg += f"   - Go to Configure → API → Settings\n"
-            error_msg += f"   - Check 'Enable ActiveX and Socket Clients'\n"
-            error_msg += f"   - Ensure correct port (7496 for TWS, 4002 for Gateway)\n"
-            error_msg += f"4. Market data subscriptions are active in your IBKR account\n"
-            error_msg += f"5. Your IBKR account has sufficient permissions for market data\n"
-            error_msg += f"{'='*60}\n"
-            error_msg += f"Original error: {str(e)}"
-
-            logger.error(error_msg)
+            logger.error(_ERROR_TEMPLATE, symbol, e)
             raise Exception(f"Market data loading failed. Please start TWS/Gateway and ensure API access is enabled. {str(e)}")
 
+    def _apply_refresh(self):
+        """Drop the loaded frame and its derived caches if a background refresh has completed"""
+        if not self._refresh_stale:
+            return
+        self._refresh_stale = False
+        self.data = None
+        self._data_loaded = False
+        self._last_loaded_range = None
+        self._cached_start = self._cached_end = None
+        self._lookup_source = self._idx = self._close = self._vix = None
+        self._hv_source = None
+        self._hv_cache = {}
+
+    def _refresh_lookup(self):
+        """Cache the index and Close/VIX arrays for the currently loaded frame"""
+        if self._lookup_source is self.data:
+            return
+        # Positions come from the index's own hash engine (get_loc / get_indexer), not a Python dict
+        self._idx = self.data.index
+        self._close = self.data['Close'].to_numpy()
+        self._vix = self.data['VIX'].to_numpy() if 'VIX' in self.data.columns else None
+        self._lookup_source = self.data
+
     def get_current_price(self, date: pd.Timestamp) -> float:
         """Get price for a given date"""
+        self._apply_refresh()
+        if self.data is None or not self._data_loaded:
+            self.load_data()
+        self._refresh_lookup()
+        # get_loc also resolves date strings; raises KeyError for dates not in the data like .loc
+        return float(self._close[self._idx.get_loc(date)])
+
+    def get_prices(self, dates) -> np.ndarray:
+        """Get Close prices for many dates in one vectorized lookup
+
+        Args:
+            dates: Sequence of dates (Timestamps, datetimes or date strings)
+
+        Returns:
+            np.ndarray: Close price for each date, in the order given
+        """
+        self._apply_refresh()
         if self.data is None or not self._data_loaded:
             self.load_data()
-        return float(self.data.loc[date, 'Close'])
+        self._refresh_lookup()
+        dates = pd.DatetimeIndex(dates)
+        positions = self._idx.get_indexer(dates)
+        if (positions < 0).any():
+            raise KeyError(f"Dates not in data: {list(dates[positions < 0])}")
+        return self._close[positions]
 
     def get_current_vix(self, date: pd.Timestamp) -> float:
         """Get VIX for a given date"""
+        self._apply_refresh()
         if self.data is None or not self._data_loaded:
             self.load_data()
+        self._refresh_lookup()
 
-        if 'VIX' in self.data.columns:
-            return float(self.data.loc[date, 'VIX'])
+        if self._vix is not None:
+            return float(self._vix[self._idx.get_loc(date)])
         else:
             # Return default volatility if VIX not available
             return 0.20
@@ -311,25 +510,25 @@ class MarketData:
             end_date (pd.Timestamp or str, optional): End date. Defaults to None (use latest date).
 
         Returns:
-            pd.DataFrame: Filtered data for the specified date range
+            pd.DataFrame: Filtered data for the specified date range. This is a slice of the
+            loaded frame, not a copy - call .copy() before modifying it independently.
         """
-        # Convert string dates to pandas timestamps if needed
-        if isinstance(start_date, str):
-            start_str = start_date
-            start_date = pd.to_datetime(start_date)
-        else:
-            start_str = start_date.strftime("%Y-%m-%d") if start_date else None
+        # Parse each bound once; load_data formats Timestamps for the DB itself
+        start_date = pd.Timestamp(start_date) if start_date is not None else None
+        end_date = pd.Timestamp(end_date) if end_date is not None else None
 
-        if isinstance(end_date, str):
-            end_str = end_date
-            end_date = pd.to_datetime(end_date)
-        else:
-            end_str = end_date.strftime("%Y-%m-%d") if end_date else None
+        self._apply_refresh()
+
+        # Daily data already loaded over a range containing both bounds is sliced directly below
+        covered = (self._data_loaded and self._cached_start is not None and
+                   self._last_loaded_range[2] == '1 day' and
+                   start_date is not None and end_date is not None and
+                   self._cached_start <= start_date and end_date <= self._cached_end)
 
         # Load data with the requested range to ensure we have the right data
-        if start_str or end_str:
-            logger.info(f"Loading data for range: {start_str} to {end_str}")
-            self.load_data(start_str, end_str)
+        if (start_date is not None or end_date is not None) and not covered:
+            logger.info(f"Loading data for range: {start_date} to {end_date}")
+            self.load_data(start_date, end_date)
 
         # Make sure data is loaded
         if not self._data_loaded:
@@ -337,16 +536,11 @@ class MarketData:
 
         # Return all data if no range specified
         if start_date is None and end_date is None:
-            return self.data.copy()
-
-        # Filter data to specified range
-        filtered_data = self.data.copy()
-
-        if start_date is not None:
-            filtered_data = filtered_data[filtered_data.index >= start_date]
+            return self.data
 
-        if end_date is not None:
-            filtered_data = filtered_data[filtered_data.index <= end_date]
+        # Filter data to specified range - label slice on the sorted DatetimeIndex (binary search,
+        # inclusive on both ends like the >= / <= masks it replaces; None leaves a side open)
+        filtered_data = self.data.loc[start_date:end_date]
 
         if filtered_data.empty:
             raise ValueError(f"No data available for the specified date range: {start_date} to {end_date}")
@@ -363,42 +557,80 @@ class MarketData:
         Returns:
             pd.Series: Historical volatility series
         """
+        self._apply_refresh()
         if self.data is None or not self._data_loaded:
             self.load_data()
 
-        # Calculate daily returns
-        daily_returns = np.log(self.data['Close'] / self.data['Close'].shift(1))
-
-        # Calculate rolling standard deviation and annualize
+        # Results depend only on the loaded frame and the window, so repeat calls are served from cache
+        if self._hv_source is not self.data:
+            self._hv_cache = {}
+            self._hv_source = self.data
+        cached = self._hv_cache.get(window)
+        if cached is not None:
+            return cached.copy()
+
+        # Calculate daily log returns as a diff of log prices (one log pass, no shifted copy)
+        log_close = np.log(self.data['Close'].to_numpy(dtype=np.float64))
+        daily_returns = np.empty_like(log_close)
+        daily_returns[:1] = np.nan
+        np.subtract(log_close[1:], log_close[:-1], out=daily_returns[1:])
+
+        # Calculate rolling (sample, ddof=1) standard deviation and annualize
         # Multiply by sqrt(252) to annualize (252 trading days in a year)
-        historical_vol = daily_returns.rolling(window=window).std() * np.sqrt(252)
+        if bn is not None:
+            rolling_std = bn.move_std(daily_returns, window=window, min_count=window, ddof=1)
+        elif numba is not None:
+            rolling_std = _rolling_std(daily_returns, window)
+        else:
+            rolling_std = pd.Series(daily_returns).rolling(window=window).std().to_numpy()
 
-        return historical_vol
+        volatility = pd.Series(rolling_std * np.sqrt(252.0), index=self.data.index, name='Close')
+        self._hv_cache[window] = volatility
+        return volatility.copy()
 
-    def refresh_data(self) -> bool:
-        """Force refresh data from IBKR API"""
-        try:
-            logger.info(f"Force refreshing data for {self.symbol}")
+    def refresh_data(self, wait: bool = False) -> bool:
+        """Force refresh data from IBKR API in the background
 
-            # Clear cached data
-            self.data = None
-            self._data_loaded = False
-            self._last_loaded_range = None
+        The currently loaded data keeps serving until the fetch completes; only then are the
+        instance and process-wide caches dropped so the next read re-loads from the database.
 
-            # Force fetch from IBKR
-            success = ibkr_service.fetch_and_store_data(self.symbol, "10 Y")
+        Args:
+            wait: Block until the refresh finishes (default: False, return as soon as it is queued)
 
-            if success:
-                logger.info(f"Successfully refreshed data for {self.symbol}")
-                return True
+        Returns:
+            bool: True if a refresh is queued or running (or, with wait=True, finished successfully)
+        """
+        try:
+            if self._refresh_future is not None and not self._refresh_future.done():
+                logger.info(f"Refresh already in progress for {self.symbol}")
             else:
-                logger.error(f"Failed to refresh data for {self.symbol}")
-                return False
+                logger.info(f"Force refreshing data for {self.symbol}")
+                self._refresh_future = _refresh_executor.submit(_fetch_and_invalidate, self.symbol, "10 Y")
+                self._refresh_future.add_done_callback(self._on_refresh_done)
+
+            if wait:
+                # result() can return before the done-callback runs, so mark the instance stale here
+                # too; the process-wide cache was already dropped by _fetch_and_invalidate
+                success = bool(self._refresh_future.result())
+                if success:
+                    self._refresh_stale = True
+                return success
+            return True
 
         except Exception as e:
             logger.error(f"Error refreshing data for {self.symbol}: {e}")
             return False
 
+    def _on_refresh_done(self, future):
+        """Drop cached data once a background refresh has stored fresh bars"""
+        if future.cancelled() or future.exception() is not None or not future.result():
+            logger.error(f"Failed to refresh data for {self.symbol}")
+            return
+
+        # The process-wide cache was dropped on the worker; the instance state is reset by the owning thread
+        self._refresh_stale = True
+        logger.info(f"Successfully refreshed data for {self.symbol}")
+
     def get_data_status(self, start_date: str = None, end_date: str = None) -> Dict[str, Any]:
         """Get information about data availability and coverage
 
@@ -432,7 +664,7 @@ class MarketData:
                 "has_data": True,
                 "records_count": len(df),
                 "requested_range": f"{start_date} to {end_date}",
-                "available_range": f"{df.index.min().strftime('%Y-%m-%d')} to {df.index.max().strftime('%Y-%m-%d')}",
+                "available_range": f"{df.index[0].strftime('%Y-%m-%d')} to {df.index[-1].strftime('%Y-%m-%d')}",
                 "coverage_complete": True,  # We could add more sophisticated coverage analysis here
                 "message": "Data available"
             }
@@ -446,11 +678,74 @@ class MarketData:
             }
 
 
+def _norm_cdf(x):
+    """Standard normal CDF for a scalar (erfc keeps precision in the lower tail)"""
+    return 0.5 * math.erfc(-x / math.sqrt(2.0))
+
+
+def _black_scholes_call_scalar(S, K, T, r, sigma):
+    """Black-Scholes call price for positive scalar T and sigma, using only math functions"""
+    sigma_sqrt_t = sigma * math.sqrt(T)
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / sigma_sqrt_t
+    d2 = d1 - sigma_sqrt_t
+    return S * _norm_cdf(d1) - K * math.exp(-r * T) * _norm_cdf(d2)
+
+
+def _rolling_std(values, window):
+    """Rolling sample (ddof=1) standard deviation, NaN until a window holds `window` valid values
+
+    Single pass with Welford add/remove updates, so each step is O(1) whatever the window size.
+    Only used compiled (numba) when bottleneck is unavailable.
+    """
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        x = values[i]
+        if not np.isnan(x):
+            count += 1
+            delta = x - mean
+            mean += delta / count
+            m2 += delta * (x - mean)
+        if i >= window:
+            y = values[i - window]
+            if not np.isnan(y):
+                count -= 1
+                if count == 0:
+                    mean = 0.0
+                    m2 = 0.0
+                else:
+                    delta = y - mean
+                    mean -= delta / count
+                    m2 -= delta * (y - mean)
+        if count == window and window > 1:
+            out[i] = math.sqrt(max(m2, 0.0) / (count - 1))
+    return out
+
+
+if numba is not None:
+    _norm_cdf = numba.njit(cache=True)(_norm_cdf)
+    _black_scholes_call_scalar = numba.njit(cache=True)(_black_scholes_call_scalar)
+    _rolling_std = numba.njit(cache=True)(_rolling_std)
+
+
 # Utility function for Black-Scholes calculations (preserved from original)
 def black_scholes_call(S, K, T, r, sigma):
-    """Calculate Black-Scholes call option price"""
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
+    """Calculate Black-Scholes call option price (scalars or broadcastable arrays)"""
+    # Scalar calls from backtest loops skip numpy dispatch entirely (compiled when numba is installed);
+    # T or sigma of zero keeps the numpy path, where the infinite d1/d2 yields the intrinsic value
+    if all(isinstance(x, (int, float)) for x in (S, K, T, r, sigma)) and T > 0 and sigma > 0:
+        return _black_scholes_call_scalar(float(S), float(K), float(T), float(r), float(sigma))
+
+    # ndtr is the standard normal CDF that norm.cdf wraps, minus the frozen-distribution layer.
+    # Imported here so only array callers pay scipy's import cost (cached after the first call).
+    from scipy.special import ndtr
+
+    sigma_sqrt_t = sigma * np.sqrt(T)
+    d1 = (np.log(S / K) + (r + 0.5 * sigma * sigma) * T) / sigma_sqrt_t
+    d2 = d1 - sigma_sqrt_t
 
-    call_price = S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
+    call_price = S * ndtr(d1) - K * np.exp(-r * T) * ndtr(d2)
     return call_price
\ No newline at end of file
@@ -1,31 +1,46 @@
+import csv
 import importlib.util
+import io
+import logging
 import os
 import sys
+import threading
+import weakref
+from contextlib import contextmanager
 
-import pandas as pd
-import numpy as np  # Add numpy import for isinf function
-import psycopg2
 from dotenv import load_dotenv
-from psycopg2.extras import DictCursor, Json
+
+logger = logging.getLogger(__name__)
+
+# pandas, numpy and psycopg2 are imported inside the functions that use them
+# so importing this module (Flask boot, init_db.py) does not pay for them
 
 # CRITICAL FIX: Create absolute paths to the strategy modules
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 BASE_DIR = os.path.dirname(os.path.dirname(SCRIPT_DIR))  # Get two directories up
-os.environ["PYTHONPATH"] = f"{os.environ.get('PYTHONPATH', '')}:{BASE_DIR}"
-print(f"Set PYTHONPATH to include: {BASE_DIR}")
-
-# Load environment variables from .env file (with graceful fallback)
-env_path = os.path.join(os.path.dirname(__file__), ".env")
-root_env_path = os.path.join(os.getcwd(), ".env")
-
-if os.path.exists(env_path):
-    load_dotenv(dotenv_path=env_path)
-    print("Loaded .env from services directory")
-elif os.path.exists(root_env_path):
-    load_dotenv(dotenv_path=root_env_path)
-    print("Loaded .env from project root")
-else:
-    print("No .env file found, using default configuration")
+
+# Environment setup runs once per process; importlib.reload keeps the
+# module globals, so a re-import does not re-parse .env or extend PYTHONPATH
+_DOTENV_LOADED = globals().get("_DOTENV_LOADED", False)
+
+if not _DOTENV_LOADED:
+    os.environ["PYTHONPATH"] = f"{os.environ.get('PYTHONPATH', '')}:{BASE_DIR}"
+    logger.debug("Set PYTHONPATH to include: %s", BASE_DIR)
+
+    # Load environment variables from .env file (with graceful fallback)
+    env_path = os.path.join(os.path.dirname(__file__), ".env")
+    root_env_path = os.path.join(os.getcwd(), ".env")
+
+    if os.path.exists(env_path):
+        load_dotenv(dotenv_path=env_path)
+        logger.info("Loaded .env from services directory")
+    elif os.path.exists(root_env_path):
+        load_dotenv(dotenv_path=root_env_path)
+        logger.info("Loaded .env from project root")
+    else:
+        logger.warning("No .env file found, using default configuration")
+
+    _DOTENV_LOADED = True
 
 # Base path for all strategies
 ALGO_BASE_PATH = os.environ.get("ALGO_BASE_PATH", "C:/ALGO/algo_trading")
@@ -41,37 +56,102 @@ STRATEGY_PATHS = {
 for path in STRATEGY_PATHS.values():
     if path not in sys.path and os.path.exists(path):
         sys.path.append(path)
-        print(f"Added strategy path: {path}")
+        logger.debug("Added strategy path: %s", path)
 
 # Database connection parameters from environment variables
+_DB_ENV_VARS = {
+    "dbname": "DB_NAME",
+    "user": "DB_USER",
+    "password": "DB_PASSWORD",
+    "host": "DB_HOST",
+    "port": "DB_PORT",
+}
+
+# Unset variables are left out so psycopg2 uses its own defaults
 DB_CONFIG = {
-    "dbname": os.environ.get("DB_NAME"),
-    "user": os.environ.get("DB_USER"),
-    "password": os.environ.get("DB_PASSWORD"),
-    "host": os.environ.get("DB_HOST"),
-    "port": os.environ.get("DB_PORT"),
+    key: value
+    for key, value in ((key, os.environ.get(env_var)) for key, env_var in _DB_ENV_VARS.items())
+    if value is not None
 }
 
-# Remove None values if they exist to let psycopg2 use its own defaults
-DB_CONFIG = {k: v for k, v in DB_CONFIG.items() if v is not None}
+# Rows per multi-VALUES statement when saving daily performance
+DAILY_PERFORMANCE_PAGE_SIZE = 500
+
+# Saves with more daily rows than this stream them with COPY instead of INSERTs
+DAILY_PERFORMANCE_COPY_THRESHOLD = 1000
+
+# Rows fetched per round trip by the server-side cursor in get_simulation_results
+DAILY_PERFORMANCE_ITERSIZE = 2000
+
+# Connection pool shared by the database helpers, created on first use
+DB_POOL_MIN_CONN = 1
+DB_POOL_MAX_CONN = int(os.environ.get("DB_POOL_SIZE", "25"))
+_DB_POOL = None
+_DB_POOL_LOCK = threading.Lock()
+
+# Result of validate_db_config; DB_CONFIG is fixed at import, so it is computed once
+_DB_CONFIG_VALID = None
+
+# Server-side prepared simulation insert, parsed and planned once per pooled connection
+_SIM_INSERT_STATEMENT = "sim_insert"
+_SIM_INSERT_PREPARE_SQL = f"""
+    PREPARE {_SIM_INSERT_STATEMENT} (varchar, jsonb, date, date, float8) AS
+    INSERT INTO strategy_simulations
+    (strategy_type, config, start_date, end_date, initial_balance)
+    VALUES ($1, $2, $3, $4, $5)
+    RETURNING id
+"""
+_SIM_INSERT_EXECUTE_SQL = f"EXECUTE {_SIM_INSERT_STATEMENT} (%s, %s, %s, %s, %s)"
+
+# Pooled connections whose session already holds the prepared simulation insert
+_PREPARED_CONNECTIONS = weakref.WeakSet()
 
 
 # Check for required database configuration
 def validate_db_config():
-    """Validate that required database configuration is present"""
+    """Validate that required database configuration is present (checked and reported once per process)"""
+    global _DB_CONFIG_VALID
+    if _DB_CONFIG_VALID is not None:
+        return _DB_CONFIG_VALID
+
     required_keys = ["dbname", "user", "password"]
     missing_keys = [key for key in required_keys if key not in DB_CONFIG or not DB_CONFIG[key]]
 
     if missing_keys:
-        print(f"ERROR: Missing required database configuration: {', '.join(missing_keys)}")
-        print("Please check your .env file or environment variables")
-        return False
-    return True
+        logger.error("Missing required database configuration: %s", ", ".join(missing_keys))
+        logger.warning("Please check your .env file or environment variables")
+    _DB_CONFIG_VALID = not missing_keys
+    return _DB_CONFIG_VALID
 
 
+# Set DEBUG_IMPORTS=1 to trace each step of import_strategy
+DEBUG_IMPORTS = os.environ.get("DEBUG_IMPORTS") == "1"
+
 # Dictionary to hold imported strategy modules
 strategy_modules = {}
 
+# Modules loaded from explicit file paths by the strategy runners, keyed by (directory, file stem)
+_MODULE_CACHE = {}
+_MODULE_CACHE_LOCK = threading.Lock()
+
+
+def _load_module(directory, file_stem, module_name=None):
+    """
+    Load <directory>/<file_stem>.py as a module (named module_name, default file_stem) once per
+    process; later calls return the already-executed module.
+    """
+    key = (directory, file_stem)
+    with _MODULE_CACHE_LOCK:
+        module = _MODULE_CACHE.get(key)
+        if module is None:
+            spec = importlib.util.spec_from_file_location(
+                module_name or file_stem, os.path.join(directory, file_stem + ".py")
+            )
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            _MODULE_CACHE[key] = module
+        return module
+
 
 # Create stub classes for IDE to stop complaining
 class StubMarketData:
@@ -98,21 +178,21 @@ def ensure_strategy_paths():
     for path in STRATEGY_PATHS.values():
         if os.path.exists(path) and path not in sys.path:
             sys.path.insert(0, path)
-            print(f"Added strategy path to sys.path: {path}")
+            logger.debug("Added strategy path to sys.path: %s", path)
 
     # Also add the strategy parent directory
     parent_dir = os.path.dirname(ALGO_BASE_PATH)
     if os.path.exists(parent_dir) and parent_dir not in sys.path:
         sys.path.insert(0, parent_dir)
-        print(f"Added strategy parent directory to sys.path: {parent_dir}")
+        logger.debug("Added strategy parent directory to sys.path: %s", parent_dir)
 
     # Add the current directory too
     current_dir = os.getcwd()
     if current_dir not in sys.path:
         sys.path.insert(0, current_dir)
-        print(f"Added current directory to sys.path: {current_dir}")
+        logger.debug("Added current directory to sys.path: %s", current_dir)
 
-    print(f"sys.path now contains: {sys.path}")
+    logger.debug("sys.path now contains: %s", sys.path)
     return True
 
 
@@ -134,8 +214,8 @@ def ensure_strategy_dependencies():
             missing_packages.append(package)
 
     if missing_packages:
-        print(f"Missing required packages: {', '.join(missing_packages)}")
-        print("Please install them using: pip install " + " ".join(missing_packages))
+        logger.warning("Missing required packages: %s", ", ".join(missing_packages))
+        logger.warning("Please install them using: pip install %s", " ".join(missing_packages))
         return False
     return True
 
@@ -150,20 +230,21 @@ def import_strategy(strategy_type):
     Returns:
         tuple: (TradingSimulator, OptionStrategy, bool) or (None, None, False) if import fails
     """
+    # Already imported: no dependency check, path checks or output
+    if strategy_type in strategy_modules:
+        return strategy_modules[strategy_type]
+
     # First check dependencies
     if not ensure_strategy_dependencies():
         return None, None, False
 
-    if strategy_type in strategy_modules:
-        return strategy_modules[strategy_type]
-
     if strategy_type not in STRATEGY_PATHS:
-        print(f"Unknown strategy type: {strategy_type}")
+        logger.warning("Unknown strategy type: %s", strategy_type)
         return None, None, False
 
     path = STRATEGY_PATHS[strategy_type]
     if not os.path.exists(path):
-        print(f"Strategy path does not exist: {path}")
+        logger.warning("Strategy path does not exist: %s", path)
         return None, None, False
 
     # Important: Clear sys.modules of any previous imports that might conflict
@@ -176,44 +257,42 @@ def import_strategy(strategy_type):
             "config",
         ]:
             del sys.modules[key]
-            print(f"Removed previous import of {key} from sys.modules")
+            if DEBUG_IMPORTS:
+                logger.debug("Removed previous import of %s from sys.modules", key)
 
     # Add strategy path to system path if not already added
     if path not in sys.path:
         sys.path.insert(0, path)
-        print(f"Added strategy path to sys.path: {path}")
+        if DEBUG_IMPORTS:
+            logger.debug("Added strategy path to sys.path: %s", path)
 
     try:
         # Attempt to import the required modules
-        # Log more detailed import attempts
-        print(f"Attempting to import strategy modules from {path}")
-        print(f"Current sys.path: {sys.path}")
+        if DEBUG_IMPORTS:
+            logger.debug("Attempting to import strategy modules from %s", path)
+            logger.debug("Current sys.path: %s", sys.path)
 
         if strategy_type == "SPY_POWER_CASHFLOW":
             try:
-                # Try explicit imports with full path
-                print(f"Importing from {path}")
                 sys.path.insert(0, path)
 
-                # Look for the module files explicitly
-                module_files = os.listdir(path)
-                print(f"Files in strategy directory: {module_files}")
-
                 # Import with more verbose error handling
                 try:
                     from trading_simulator import TradingSimulator
 
-                    print("Successfully imported TradingSimulator")
+                    if DEBUG_IMPORTS:
+                        logger.debug("Successfully imported TradingSimulator")
                 except ImportError as e:
-                    print(f"Failed to import TradingSimulator: {str(e)}")
+                    logger.error("Failed to import TradingSimulator: %s", e)
                     raise
 
                 try:
                     from option_strategy import OptionStrategy
 
-                    print("Successfully imported OptionStrategy")
+                    if DEBUG_IMPORTS:
+                        logger.debug("Successfully imported OptionStrategy")
                 except ImportError as e:
-                    print(f"Failed to import OptionStrategy: {str(e)}")
+                    logger.error("Failed to import OptionStrategy: %s", e)
                     raise
 
                 strategy_modules[strategy_type] = (
@@ -223,30 +302,27 @@ def import_strategy(strategy_type):
                 )
                 return TradingSimulator, OptionStrategy, True
             except Exception as e:
-                print(f"Detailed import error: {str(e)}")
+                logger.error("Detailed import error: %s", e)
                 raise
 
         elif strategy_type == "OPTIONS_MARTIN":
             try:
-                # Import OPTIONS_MARTIN modules
-                print(f"Importing OPTIONS_MARTIN from {path}")
                 sys.path.insert(0, path)
 
-                module_files = os.listdir(path)
-                print(f"Files in OPTIONS_MARTIN directory: {module_files}")
-
                 try:
                     from trading_simulator import TradingSimulator
-                    print("Successfully imported TradingSimulator")
+                    if DEBUG_IMPORTS:
+                        logger.debug("Successfully imported TradingSimulator")
                 except ImportError as e:
-                    print(f"Failed to import TradingSimulator: {str(e)}")
+                    logger.error("Failed to import TradingSimulator: %s", e)
                     raise
 
                 try:
                     from option_strategy import OptionStrategy
-                    print("Successfully imported OptionStrategy")
+                    if DEBUG_IMPORTS:
+                        logger.debug("Successfully imported OptionStrategy")
                 except ImportError as e:
-                    print(f"Failed to import OptionStrategy: {str(e)}")
+                    logger.error("Failed to import OptionStrategy: %s", e)
                     raise
 
                 strategy_modules[strategy_type] = (
@@ -256,30 +332,27 @@ def import_strategy(strategy_type):
                 )
                 return TradingSimulator, OptionStrategy, True
             except Exception as e:
-                print(f"Detailed import error for OPTIONS_MARTIN: {str(e)}")
+                logger.error("Detailed import error for OPTIONS_MARTIN: %s", e)
                 raise
 
         elif strategy_type == "SPY500_LEADER":
             try:
-                # Import SPY500_LEADER modules
-                print(f"Importing SPY500_LEADER from {path}")
                 sys.path.insert(0, path)
 
-                module_files = os.listdir(path)
-                print(f"Files in SPY500_LEADER directory: {module_files}")
-
                 try:
                     from trading_simulator import TradingSimulator
-                    print("Successfully imported TradingSimulator")
+                    if DEBUG_IMPORTS:
+                        logger.debug("Successfully imported TradingSimulator")
                 except ImportError as e:
-                    print(f"Failed to import TradingSimulator: {str(e)}")
+                    logger.error("Failed to import TradingSimulator: %s", e)
                     raise
 
                 try:
                     from leader_strategy import LeaderStrategy
-                    print("Successfully imported LeaderStrategy")
+                    if DEBUG_IMPORTS:
+                        logger.debug("Successfully imported LeaderStrategy")
                 except ImportError as e:
-                    print(f"Failed to import LeaderStrategy: {str(e)}")
+                    logger.error("Failed to import LeaderStrategy: %s", e)
                     raise
 
                 strategy_modules[strategy_type] = (
@@ -289,87 +362,140 @@ def import_strategy(strategy_type):
                 )
                 return TradingSimulator, LeaderStrategy, True
             except Exception as e:
-                print(f"Detailed import error for SPY500_LEADER: {str(e)}")
+                logger.error("Detailed import error for SPY500_LEADER: %s", e)
                 raise
 
-        print(f"Could not import strategy modules for {strategy_type}")
+        logger.error("Could not import strategy modules for %s", strategy_type)
         return None, None, False
     except ImportError as e:
-        print(f"Error importing strategy {strategy_type}: {str(e)}")
+        logger.error("Error importing strategy %s: %s", strategy_type, e)
         return None, None, False
 
 
+def _get_db_pool():
+    """
+    Create the module connection pool on first use.
+    """
+    global _DB_POOL
+    with _DB_POOL_LOCK:
+        if _DB_POOL is None:
+            logger.debug("Connecting to database with parameters:")
+            logger.debug("  dbname: %s", DB_CONFIG.get("dbname"))
+            logger.debug("  user: %s", DB_CONFIG.get("user"))
+            # Only print host and port if they exist in the config
+            if "host" in DB_CONFIG:
+                logger.debug("  host: %s", DB_CONFIG.get("host"))
+            if "port" in DB_CONFIG:
+                logger.debug("  port: %s", DB_CONFIG.get("port"))
+            from psycopg2.pool import ThreadedConnectionPool
+
+            _DB_POOL = ThreadedConnectionPool(DB_POOL_MIN_CONN, DB_POOL_MAX_CONN, **DB_CONFIG)
+        return _DB_POOL
+
+
+def _ensure_sim_insert_prepared(conn):
+    """
+    PREPARE the strategy_simulations insert on this connection's session if it is not there yet.
+    """
+    if conn in _PREPARED_CONNECTIONS:
+        return
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_prepared_statements WHERE name = %s", (_SIM_INSERT_STATEMENT,))
+        if cursor.fetchone() is None:
+            cursor.execute(_SIM_INSERT_PREPARE_SQL)
+    # Commit on its own so a later rollback of the save transaction cannot affect the statement
+    conn.commit()
+    _PREPARED_CONNECTIONS.add(conn)
+
+
+@contextmanager
 def get_db_connection():
     """
-    Establish and return a connection to the PostgreSQL database.
+    Borrow a pooled connection to the PostgreSQL database for the duration of a with block.
+    Yields None if the database is not configured or cannot be reached.
     """
     if not validate_db_config():
-        return None
+        yield None
+        return
 
     try:
-        print("Connecting to database with parameters:")
-        print(f"  dbname: {DB_CONFIG.get('dbname')}")
-        print(f"  user: {DB_CONFIG.get('user')}")
-        # Only print host and port if they exist in the config
-        if "host" in DB_CONFIG:
-            print(f"  host: {DB_CONFIG.get('host')}")
-        if "port" in DB_CONFIG:
-            print(f"  port: {DB_CONFIG.get('port')}")
-        connection = psycopg2.connect(**DB_CONFIG)
-        return connection
+        pool = _get_db_pool()
+        connection = pool.getconn()
     except Exception as e:
-        print(f"Database connection error: {str(e)}")
-        return None
+        logger.error("Database connection error: %s", e)
+        yield None
+        return
+
+    try:
+        yield connection
+    finally:
+        # The pool rolls back any open transaction; drop connections the server has closed
+        pool.putconn(connection, close=bool(connection.closed))
 
 
 def init_database():
     """
     Initialize the database tables if they don't exist.
     """
-    conn = get_db_connection()
-    if not conn:
-        return False
+    with get_db_connection() as conn:
+        if not conn:
+            return False
 
-    try:
-        with conn.cursor() as cursor:
-            # Create strategy simulations table
-            cursor.execute(
+        try:
+            with conn.cursor() as cursor:
+                # Create strategy simulations table
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS strategy_simulations (
+                        id SERIAL PRIMARY KEY,
+                        strategy_type VARCHAR(50) NOT NULL,
+                        config JSONB NOT NULL,
+                        start_date DATE NOT NULL,
+                        end_date DATE NOT NULL,
+                        initial_balance FLOAT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
                 """
-                CREATE TABLE IF NOT EXISTS strategy_simulations (
-                    id SERIAL PRIMARY KEY,
-                    strategy_type VARCHAR(50) NOT NULL,
-                    config JSONB NOT NULL,
-                    start_date DATE NOT NULL,
-                    end_date DATE NOT NULL,
-                    initial_balance FLOAT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
-            """
-            )
 
-            # Create daily performance table
-            cursor.execute(
+                # Create daily performance table
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS daily_performance (
+                        id SERIAL PRIMARY KEY,
+                        simulation_id INTEGER REFERENCES strategy_simulations(id),
+                        date DATE NOT NULL,
+                        balance FLOAT NOT NULL,
+                        trades_count INTEGER NOT NULL,
+                        profit_loss FLOAT NOT NULL
+                    )
                 """
-                CREATE TABLE IF NOT EXISTS daily_performance (
-                    id SERIAL PRIMARY KEY,
-                    simulation_id INTEGER REFERENCES strategy_simulations(id),
-                    date DATE NOT NULL,
-                    balance FLOAT NOT NULL,
-                    trades_count INTEGER NOT NULL,
-                    profit_loss FLOAT NOT NULL
                 )
-            """
-            )
 
-            conn.commit()
-            print("Database tables initialized successfully")
-            return True
-    except Exception as e:
-        conn.rollback()
-        print(f"Error initializing database: {str(e)}")
-        return False
-    finally:
-        conn.close()
+                # Covering index for get_simulation_results (Postgres does not index foreign keys)
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_daily_performance_simulation_date
+                    ON daily_performance (simulation_id, date)
+                    INCLUDE (balance, trades_count, profit_loss)
+                """
+                )
+
+                # Newest-first listing in get_simulations
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_strategy_simulations_created
+                    ON strategy_simulations (created_at DESC, id DESC)
+                """
+                )
+
+                conn.commit()
+                logger.info("Database tables initialized successfully")
+                return True
+        except Exception as e:
+            conn.rollback()
+            logger.error("Error initializing database: %s", e)
+            return False
 
 
 def save_simulation_results(strategy_type, config, start_date, end_date, initial_balance, daily_results):
@@ -387,56 +513,65 @@ def save_simulation_results(strategy_type, config, start_date, end_date, initial
     Returns:
         int: ID of the saved simulation
     """
-    conn = get_db_connection()
-    if not conn:
-        return None
+    from psycopg2.extras import Json, execute_values
 
-    try:
-        with conn.cursor() as cursor:
-            # Insert strategy simulation record
-            cursor.execute(
-                """
-                INSERT INTO strategy_simulations
-                (strategy_type, config, start_date, end_date, initial_balance)
-                VALUES (%s, %s, %s, %s, %s)
-                RETURNING id
-            """,
-                (
-                    strategy_type,
-                    Json(config),
-                    start_date,
-                    end_date,
-                    initial_balance,
-                ),
-            )
+    with get_db_connection() as conn:
+        if not conn:
+            return None
 
-            simulation_id = cursor.fetchone()[0]
-
-            # Insert daily performance records
-            for date_str, data in daily_results.items():
+        try:
+            _ensure_sim_insert_prepared(conn)
+            with conn.cursor() as cursor:
+                # Insert strategy simulation record
                 cursor.execute(
-                    """
-                    INSERT INTO daily_performance
-                    (simulation_id, date, balance, trades_count, profit_loss)
-                    VALUES (%s, %s, %s, %s, %s)
-                """,
+                    _SIM_INSERT_EXECUTE_SQL,
                     (
-                        simulation_id,
-                        date_str,
-                        data["balance"],
-                        data["trades_count"],
-                        data["profit_loss"],
+                        strategy_type,
+                        Json(config),
+                        start_date,
+                        end_date,
+                        initial_balance,
                     ),
                 )
 
-            conn.commit()
-            return simulation_id
-    except Exception as e:
-        conn.rollback()
-        print(f"Error saving simulation results: {str(e)}")
-        return None
-    finally:
-        conn.close()
+                simulation_id = cursor.fetchone()[0]
+
+                rows = [
+                    (simulation_id, date_str, data["balance"], data["trades_count"], data["profit_loss"])
+                    for date_str, data in daily_results.items()
+                ]
+                if len(rows) > DAILY_PERFORMANCE_COPY_THRESHOLD:
+                    # Multi-year runs: stream the rows as CSV over the COPY protocol
+                    buf = io.StringIO()
+                    csv.writer(buf).writerows(rows)
+                    buf.seek(0)
+                    cursor.copy_expert(
+                        """
+                        COPY daily_performance
+                            (simulation_id, date, balance, trades_count, profit_loss)
+                        FROM STDIN WITH (FORMAT csv)
+                    """,
+                        buf,
+                    )
+                else:
+                    # Insert daily performance records, batched into multi-VALUES statements
+                    execute_values(
+                        cursor,
+                        """
+                        INSERT INTO daily_performance
+                        (simulation_id, date, balance, trades_count, profit_loss)
+                        VALUES %s
+                    """,
+                        rows,
+                        page_size=DAILY_PERFORMANCE_PAGE_SIZE,
+                    )
+
+                conn.commit()
+                return simulation_id
+        except Exception as e:
+            conn.rollback()
+            logger.error("Error saving simulation results: %s", e)
+            return None
 
 
 def run_strategy_simulation(
@@ -479,44 +614,266 @@ def run_strategy_simulation(
                 results,
             )
             if simulation_id:
-                print(f"Simulation results saved with ID: {simulation_id}")
+                logger.info("Simulation results saved with ID: %s", simulation_id)
 
         return results
 
     except Exception as e:
-        print(f"Error running strategy simulation: {str(e)}")
+        logger.error("Error running strategy simulation: %s", e)
         return None
 
 
+# Column names the simulators have used for the trading log, in order of preference
+TRADING_LOG_COLUMNS = ["Trading_Log", "Trading Log", "trading_log"]
+
+# Daily result schema per strategy type:
+#   fields: (field, candidate result columns, type) in output order; fields with no candidate
+#           columns (e.g. spy_value, the buy & hold value) are computed by the runner
+#   decimal_places: rounding applied to float fields (None keeps full precision)
+#   warn_missing: log a warning when none of a field's candidate columns is present
+RESULT_SCHEMAS = {
+    "SPY_POWER_CASHFLOW": {
+        "fields": [
+            ("Portfolio_Value", ["Portfolio_Value", "Portfolio Value", "portfolio_value"], float),
+            ("Cash_Balance", ["Cash_Balance", "Cash Balance", "cash_balance"], float),
+            ("Close", ["Close"], float),
+            ("Margin_Ratio", ["Margin_Ratio", "Margin Ratio", "margin_ratio"], float),
+            ("spy_value", None, float),
+            ("Interest_Paid", ["Interest_Paid", "Interests_Paid", "Interests Paid", "interests_paid"], float),
+            ("Premiums_Received", ["Premiums_Received", "Premiums Received", "premiums_received"], float),
+            ("Dividends_Received", ["Dividends_Received", "dividends_received"], float),
+            ("Commissions_Paid", ["Commissions_Paid", "Commissions Paid", "commissions_paid"], float),
+            ("Open_Positions", ["Open_Positions", "Open Positions", "open_positions"], int),
+            ("Closed_Positions", ["Closed_Positions", "Closed Positions", "closed_positions"], int),
+            ("Open", ["Open"], float),
+            ("High", ["High"], float),
+            ("Low", ["Low"], float),
+            ("VIX", ["VIX"], float),
+            ("Trading_Log", TRADING_LOG_COLUMNS, str),
+        ],
+        "decimal_places": 4,
+        "warn_missing": True,
+    },
+    "OPTIONS_MARTIN": {
+        "fields": [
+            ("Cash_Balance", ["Cash_Balance"], float),
+            ("Position", ["Position"], int),
+            ("Position_Balance", ["Position_Balance"], float),
+            ("Portfolio_Value", ["Portfolio_Value"], float),
+            ("Total_Rounds", ["Total_Rounds"], int),
+            ("Total_Profit", ["Total_Profit"], float),
+            ("Close", ["Close"], float),
+            ("Open", ["Open"], float),
+            ("High", ["High"], float),
+            ("Low", ["Low"], float),
+            ("Trading_Log", TRADING_LOG_COLUMNS, str),
+        ],
+        "decimal_places": None,
+        "warn_missing": False,
+    },
+    "SPY500_LEADER": {
+        "fields": [
+            ("Portfolio_Value", ["Portfolio_Value"], float),
+            ("Cash_Balance", ["Cash_Balance"], float),
+            ("Position_Value", ["Position_Value"], float),
+            ("Current_Holding", ["Current_Holding"], str),
+            ("Holding_Shares", ["Holding_Shares"], int),
+            ("Current_Leader", ["Current_Leader"], str),
+            ("Pending_Leader", ["Pending_Leader"], str),
+            ("Pending_Days", ["Pending_Days"], int),
+            ("Margin_Ratio", ["Margin_Ratio"], float),
+            ("Unrealized_PnL", ["Unrealized_PnL"], float),
+            ("Total_Trades", ["Total_Trades"], int),
+            ("Total_Slippage", ["Total_Slippage"], float),
+            ("Total_Commissions", ["Total_Commissions"], float),
+            ("Close", ["Close"], float),
+            ("Open", ["Open"], float),
+            ("High", ["High"], float),
+            ("Low", ["Low"], float),
+            ("Trading_Log", TRADING_LOG_COLUMNS, str),
+            ("spy_value", None, float),
+            ("isSwapTransaction", None, bool),
+        ],
+        "decimal_places": None,
+        "warn_missing": False,
+    },
+}
+
+
+def _first_column(df, possible_names):
+    """Return the first of the possible columns present in df, or None"""
+    for name in possible_names:
+        if name in df.columns:
+            return df[name]
+    return None
+
+
+def _finite_values(column, length):
+    """Column as a float64 array with unparseable, NaN and Inf values set to 0 (all zeros if missing)"""
+    import numpy as np
+    import pandas as pd
+
+    if column is None:
+        return np.zeros(length)
+    values = pd.to_numeric(column, errors="coerce").to_numpy(dtype=np.float64)
+    values[~np.isfinite(values)] = 0.0
+    return values
+
+
+def _float_values(column, length, decimal_places=4):
+    """Column as a list of Python floats rounded to decimal_places (round() semantics; None skips rounding)"""
+    values = _finite_values(column, length).tolist()
+    if decimal_places is None:
+        return values
+    return [round(v, decimal_places) for v in values]
+
+
+def _int_values(column, length):
+    """Column as a list of Python ints, truncated toward zero like int(float(value))"""
+    import numpy as np
+
+    return np.trunc(_finite_values(column, length)).astype(np.int64).tolist()
+
+
+def _str_values(column, length):
+    """Column as a list of strings (empty strings if missing)"""
+    if column is None:
+        return [""] * length
+    return column.astype(str).tolist()
+
+
+def _result_columns(strategy_type, cleaned_df):
+    """
+    Convert a cleaned results frame to per-field value lists following RESULT_SCHEMAS.
+
+    Returns:
+        tuple: (dict of field -> list of values, formatted date strings); computed fields are left
+        for the caller to add before _zip_daily_results
+    """
+    import pandas as pd
+
+    schema = RESULT_SCHEMAS[strategy_type]
+    length = len(cleaned_df)
+    columns = {}
+    # Resolve each field to a result column once, then convert whole columns at a time
+    for field, names, kind in schema["fields"]:
+        if names is None:
+            continue
+        column = _first_column(cleaned_df, names)
+        if column is None and schema["warn_missing"]:
+            logger.warning("None of the columns %s found, using default", names)
+        if kind is int:
+            columns[field] = _int_values(column, length)
+        elif kind is str:
+            columns[field] = _str_values(column, length)
+        else:
+            columns[field] = _float_values(column, length, schema["decimal_places"])
+
+    # Format all dates in one vectorized call instead of per row
+    if isinstance(cleaned_df.index, pd.DatetimeIndex):
+        date_strs = cleaned_df.index.strftime("%Y-%m-%d")
+    else:
+        date_strs = cleaned_df.index.astype(str)
+    return columns, date_strs
+
+
+def _zip_daily_results(strategy_type, columns, date_strs):
+    """
+    Assemble {date: {field: value}} from per-field value lists in the schema's field order.
+    A repeated date keeps its last row.
+    """
+    fields = [field for field, _, _ in RESULT_SCHEMAS[strategy_type]["fields"]]
+    return {
+        date_str: dict(zip(fields, values))
+        for date_str, values in zip(date_strs, zip(*(columns[field] for field in fields)))
+    }
+
+
+def _date_string(value):
+    """Date argument as a YYYY-MM-DD string (strings are passed through)"""
+    if isinstance(value, str):
+        return value
+    return value.strftime("%Y-%m-%d")
+
+
+def _apply_initial_balance(strategy_config, config, initial_balance):
+    """
+    Set strategy_config.INITIAL_CASH from the initial_balance parameter or the first balance key
+    present in config; the Config default is kept when none is given or it cannot be parsed.
+    """
+    try:
+        # Define possible parameter locations and names
+        balance_sources = [
+            ("parameter", initial_balance),
+            ("config", "initial_balance"),
+            ("config", "initialBalance"),
+            ("config", "INITIAL_CASH"),
+        ]
+
+        for source_type, source in balance_sources:
+            if source_type == "parameter" and source is not None:
+                strategy_config.INITIAL_CASH = float(source)
+                logger.debug("Using initial balance from parameter: %s", source)
+                break
+            elif source_type == "config" and source in config:
+                strategy_config.INITIAL_CASH = float(config[source])
+                logger.debug("Using %s from config: %s", source, config[source])
+                break
+    except (ValueError, TypeError) as e:
+        logger.warning("Error parsing initial balance: %s, using default", e)
+
+
+def _run_simulator(
+    TradingSimulator, PositionTracker, StrategyClass, market_data, strategy_config, start_dt, end_dt
+):
+    """
+    Load market data for the date range, wire position tracker, strategy and simulator, and run it.
+
+    Returns:
+        tuple: (results DataFrame or None, start date string, end date string)
+    """
+    start_date_str = _date_string(start_dt)
+    end_date_str = _date_string(end_dt)
+
+    logger.debug("Loading market data for date range: %s to %s", start_date_str, end_date_str)
+    market_data.load_data(start_date=start_date_str, end_date=end_date_str)
+    logger.debug("Market data loaded successfully")
+
+    logger.debug("=== Initializing PositionTracker ===")
+    position = PositionTracker(strategy_config.INITIAL_CASH, strategy_config)
+    logger.debug("PositionTracker initial balance: %s", position.cash)
+
+    logger.debug("=== Initializing %s ===", StrategyClass.__name__)
+    strategy = StrategyClass(strategy_config)
+    logger.debug("%s type: %s", StrategyClass.__name__, strategy_config.STRATEGY_TYPE)
+
+    logger.debug("=== Creating TradingSimulator ===")
+    simulator = TradingSimulator(market_data, position, strategy, strategy_config)
+    logger.debug("TradingSimulator created with all components")
+
+    logger.debug("=== Running Simulation ===")
+    logger.info("Running simulation from %s to %s", start_date_str, end_date_str)
+
+    results_df = simulator.run(start_date=start_date_str, end_date=end_date_str)
+    return results_df, start_date_str, end_date_str
+
+
 def run_spy_power_cashflow(TradingSimulator, OptionStrategy, config, start_dt, end_dt, initial_balance=None):
     """Run the SPY_POWER_CASHFLOW strategy simulation."""
-    strategy_path = STRATEGY_PATHS["SPY_POWER_CASHFLOW"]
-    original_path = sys.path.copy()
+    import pandas as pd
 
+    strategy_path = STRATEGY_PATHS["SPY_POWER_CASHFLOW"]
     try:
+        # Left in place for later runs; the modules themselves are loaded by path
         if strategy_path not in sys.path:
             sys.path.insert(0, strategy_path)
-            print(f"Temporarily added {strategy_path} to sys.path")
+            logger.debug("Added %s to sys.path", strategy_path)
 
         # Import unified market data class with database-first approach
         # Use explicit path-based import to avoid conflict with strategy's local MarketData
-        import importlib.util
-        current_services_path = os.path.dirname(__file__)
-        market_data_path = os.path.join(current_services_path, "market_data.py")
-        spec = importlib.util.spec_from_file_location("unified_market_data", market_data_path)
-        unified_market_data_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(unified_market_data_module)
-        MarketData = unified_market_data_module.MarketData
-
-        spec = importlib.util.spec_from_file_location("position", os.path.join(strategy_path, "position.py"))
-        position_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(position_module)
-        PositionTracker = position_module.PositionTracker
-
-        spec = importlib.util.spec_from_file_location("config", os.path.join(strategy_path, "config.py"))
-        config_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(config_module)
-        Config = config_module.Config
+        MarketData = _load_module(SCRIPT_DIR, "market_data", "unified_market_data").MarketData
+        PositionTracker = _load_module(strategy_path, "position").PositionTracker
+        Config = _load_module(strategy_path, "config").Config
 
         # Create a Config object
         strategy_config = Config()
@@ -532,53 +889,32 @@ def run_spy_power_cashflow(TradingSimulator, OptionStrategy, config, start_dt, e
         # Set strategy type from the request data
         strategy_config.STRATEGY_TYPE = "SPY_POWER_CASHFLOW"
 
-        # Get initial balance from request
-        try:
-            # Define possible parameter locations and names
-            balance_sources = [
-                ("parameter", initial_balance),
-                ("config", "initial_balance"),
-                ("config", "initialBalance"),
-                ("config", "INITIAL_CASH"),
-            ]
-
-            # Check each possible source
-            # balance_set = False
-            for source_type, source in balance_sources:
-                if source_type == "parameter" and source is not None:
-                    strategy_config.INITIAL_CASH = float(source)
-                    print(f"Using initial balance from parameter: {source}")
-                    # balance_set = True
-                    break
-                elif source_type == "config" and source in config:
-                    strategy_config.INITIAL_CASH = float(config[source])
-                    print(f"Using {source} from config: {config[source]}")
-                    # balance_set = True
-                    break
-
-        except (ValueError, TypeError) as e:
-            print(f"Error parsing initial balance: {e}, using default")
+        _apply_initial_balance(strategy_config, config, initial_balance)
 
         # Apply all config parameters from frontend to strategy_config
         # Print frontend config for debugging
-        print("\n=== BACKEND PARAMETER DEBUG ===")
-        print("Full config from frontend:", config)
-        print("\n=== Individual Config Parameters ===")
-        for key, value in config.items():
-            print(f"{key}: {value} (type: {type(value)})")
+        logger.debug("=== BACKEND PARAMETER DEBUG ===")
+        logger.debug("Full config from frontend: %s", config)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("=== Individual Config Parameters ===")
+            for key, value in config.items():
+                logger.debug("%s: %s (type: %s)", key, value, type(value))
 
         # Specifically check for monthly withdrawal rate parameter
-        print("\n=== MONTHLY WITHDRAWAL RATE DEBUG ===")
+        logger.debug("=== MONTHLY WITHDRAWAL RATE DEBUG ===")
         if "MONTHLY_WITHDRAWAL_RATE" in config:
-            print(f"MONTHLY_WITHDRAWAL_RATE found: {config['MONTHLY_WITHDRAWAL_RATE']}%")
+            logger.debug("MONTHLY_WITHDRAWAL_RATE found: %s%%", config["MONTHLY_WITHDRAWAL_RATE"])
         else:
-            print("MONTHLY_WITHDRAWAL_RATE not found in config")
+            logger.debug("MONTHLY_WITHDRAWAL_RATE not found in config")
 
         # Check for old parameter name (should not be present)
         if "MONTHLY_WITHDRAWAL" in config:
-            print(f"WARNING: Old MONTHLY_WITHDRAWAL parameter found: {config['MONTHLY_WITHDRAWAL']} (should use MONTHLY_WITHDRAWAL_RATE instead)")
+            logger.warning(
+                "Old MONTHLY_WITHDRAWAL parameter found: %s (should use MONTHLY_WITHDRAWAL_RATE instead)",
+                config["MONTHLY_WITHDRAWAL"],
+            )
 
-        print("=== END WITHDRAWAL RATE DEBUG ===")
+        logger.debug("=== END WITHDRAWAL RATE DEBUG ===")
 
         for key, value in config.items():
             # Set attribute directly if it matches a strategy_config attribute
@@ -587,63 +923,35 @@ def run_spy_power_cashflow(TradingSimulator, OptionStrategy, config, start_dt, e
                 try:
                     if isinstance(value, (int, float)):
                         setattr(strategy_config, key, float(value))
-                        print(f"Set {key} = {value} from frontend config")
+                        logger.debug("Set %s = %s from frontend config", key, value)
                     elif isinstance(value, str) and value.replace(".", "", 1).isdigit():
                         setattr(strategy_config, key, float(value))
-                        print(f"Set {key} = {value} from frontend config (converted to float)")
+                        logger.debug("Set %s = %s from frontend config (converted to float)", key, value)
                     else:
                         setattr(strategy_config, key, value)
-                        print(f"Set {key} = {value} from frontend config (non-numeric)")
+                        logger.debug("Set %s = %s from frontend config (non-numeric)", key, value)
                 except (ValueError, TypeError) as e:
-                    print(f"Error setting {key} from value {value}: {e}, using default")
+                    logger.warning("Error setting %s from value %s: %s, using default", key, value, e)
 
-        print("\n=== Final Config for simulation ===")
-        for attr in dir(strategy_config):
-            if not attr.startswith("__"):  # Skip private attributes
-                print(f"{attr}: {getattr(strategy_config, attr)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("=== Final Config for simulation ===")
+            for attr in dir(strategy_config):
+                if not attr.startswith("__"):  # Skip private attributes
+                    logger.debug("%s: %s", attr, getattr(strategy_config, attr))
 
         # Initialize components with debug prints
-        print("\n=== Initializing MarketData ===")
+        logger.debug("=== Initializing MarketData ===")
         market_data = MarketData(symbol=strategy_config.SYMBOL)
-        print(f"MarketData symbol: {market_data.symbol}")
+        logger.debug("MarketData symbol: %s", market_data.symbol)
 
-        # Convert datetime objects to string dates (handle both datetime and string input)
-        if isinstance(start_dt, str):
-            start_date_str = start_dt
-        else:
-            start_date_str = start_dt.strftime("%Y-%m-%d")
-
-        if isinstance(end_dt, str):
-            end_date_str = end_dt
-        else:
-            end_date_str = end_dt.strftime("%Y-%m-%d")
-
-        # Load data with user-specified date range
-        print(f"Loading market data for date range: {start_date_str} to {end_date_str}")
-        market_data.load_data(start_date=start_date_str, end_date=end_date_str)
-        print(f"Market data loaded successfully")
-
-        print("\n=== Initializing PositionTracker ===")
-        position = PositionTracker(strategy_config.INITIAL_CASH, strategy_config)
-        print(f"PositionTracker initial balance: {position.cash}")
-
-        print("\n=== Initializing OptionStrategy ===")
-        strategy = OptionStrategy(strategy_config)
-        print(f"OptionStrategy type: {strategy_config.STRATEGY_TYPE}")
-
-        print("\n=== Creating TradingSimulator ===")
-        simulator = TradingSimulator(market_data, position, strategy, strategy_config)
-        print("TradingSimulator created with all components")
-
-        print("\n=== Running Simulation ===")
-        print(f"Running simulation from {start_date_str} to {end_date_str}")
-
-        results_df = simulator.run(start_date=start_date_str, end_date=end_date_str)
+        results_df, start_date_str, end_date_str = _run_simulator(
+            TradingSimulator, PositionTracker, OptionStrategy, market_data, strategy_config, start_dt, end_dt
+        )
 
         # Process results
         daily_results = {}
         if results_df is not None and not results_df.empty:
-            print(f"Original Results DataFrame columns: {results_df.columns.tolist()}")
+            logger.debug("Original Results DataFrame columns: %s", results_df.columns.tolist())
             
             # Make a copy to avoid modifying the original
             cleaned_df = results_df.copy()
@@ -653,154 +961,52 @@ def run_spy_power_cashflow(TradingSimulator, OptionStrategy, config, start_dt, e
                 cleaned_df.index = pd.to_datetime(cleaned_df.index)
 
             # Clean DataFrame to handle NaN and Inf values
-            print("Cleaning DataFrame of NaN and Infinity values")
+            logger.debug("Cleaning DataFrame of NaN and Infinity values")
             cleaned_df = cleaned_df.replace([float('inf'), float('-inf')], 0)
             cleaned_df = cleaned_df.fillna(0)  # Replace NaN with zeros
             
             # Normalize column names (replace spaces with underscores)
-            print("Normalizing column names")
+            logger.debug("Normalizing column names")
             cleaned_df.columns = [col.replace(' ', '_') for col in cleaned_df.columns]
             
             # Print normalized column names for debugging
-            print(f"Normalized DataFrame columns: {cleaned_df.columns.tolist()}")
+            logger.debug("Normalized DataFrame columns: %s", cleaned_df.columns.tolist())
 
             # Calculate SPY buy & hold value using Close prices from results_df
             # New approach: Calculate shares purchased on first day, then keep that constant
             first_day_close = cleaned_df["Close"].iloc[0]
             initial_cash = strategy_config.INITIAL_CASH
             spy_shares_bought = initial_cash / first_day_close if first_day_close > 0 else 0
-            print(
-                f"SPY Buy & Hold: Initial cash ${initial_cash:.2f}, first day close ${first_day_close:.2f}, "
-                f"shares bought {spy_shares_bought:.2f}"
+            logger.debug(
+                "SPY Buy & Hold: Initial cash $%.2f, first day close $%.2f, shares bought %.2f",
+                initial_cash,
+                first_day_close,
+                spy_shares_bought,
             )
 
             # Calculate daily value based on fixed shares
             spy_values = cleaned_df["Close"] * spy_shares_bought
 
-            # Only include actual trading days - exclude weekends and holidays
-            trading_days = cleaned_df.index.tolist()
+            # Column names were normalized to underscores above, so the first alias usually matches
+            columns, date_strs = _result_columns("SPY_POWER_CASHFLOW", cleaned_df)
+            columns["spy_value"] = _float_values(spy_values, len(cleaned_df))
+            daily_results = _zip_daily_results("SPY_POWER_CASHFLOW", columns, date_strs)
 
-            # Define helper functions for safe value conversion
-            def safe_float(value, default=0.0, decimal_places=4):
-                """
-                Safely convert a value to a float with specified decimal places.
-                Returns default if value is NaN, Inf, or cannot be converted.
-                """
-                try:
-                    val = float(value)
-                    # Check for infinity or NaN using numpy instead of pandas
-                    if pd.isna(val) or np.isinf(val):
-                        print(f"Warning: Detected NaN or Inf value: {value}, using default {default}")
-                        return default
-                    # Round to specified decimal places
-                    return round(val, decimal_places)
-                except (ValueError, TypeError) as e:
-                    print(f"Warning: Error converting value to float: {value}, {str(e)}, using default {default}")
-                    return default
-            
-            def safe_int(value, default=0):
-                """
-                Safely convert a value to an integer.
-                Returns default if value is NaN or cannot be converted.
-                """
-                try:
-                    val = int(float(value))  # Convert to float first in case it's a float string
-                    if pd.isna(val):
-                        print(f"Warning: Detected NaN value for int conversion: {value}, using default {default}")
-                        return default
-                    return val
-                except (ValueError, TypeError) as e:
-                    print(f"Warning: Error converting value to int: {value}, {str(e)}, using default {default}")
-                    return default
-            
-            # Function to get value from row with multiple possible column names
-            def get_column_value(row_data, possible_names, default=0):
-                """
-                Try multiple possible column names to get a value from a DataFrame row.
-                Returns default if none of the column names exist.
-                """
-                # Convert Series index to list for easier checking
-                available_columns = list(row_data.index)
-                
-                for name in possible_names:
-                    if name in available_columns:
-                        val = row_data.get(name, default)
-                        # Print for debugging on first row
-                        if row_data.name == cleaned_df.index[0]:
-                            print(f"Found column '{name}' with value: {val}")
-                        return val
-                
-                # If we get here, none of the columns were found
-                if row_data.name == cleaned_df.index[0]:
-                    print(f"Warning: None of the columns {possible_names} found, using default {default}")
-                return default
-
-            print("\n=== Processing daily results ===")
-            print(f"DataFrame columns: {list(cleaned_df.columns)}")
-            print(f"Sample Interests_Paid values: {cleaned_df['Interests_Paid'].head().tolist() if 'Interests_Paid' in cleaned_df.columns else 'Column not found'}")
-            for idx, row in cleaned_df.iterrows():
-                # Skip dates that aren't in the original DataFrame
-                if idx not in trading_days:
-                    continue
-
-                date_str = idx.strftime("%Y-%m-%d")
-                
-                # Map simulator output fields to frontend expected fields with safe conversion
-                # We check for multiple possible column names since the DataFrame may use different formats
-                result_dict = {
-                    "Portfolio_Value": safe_float(get_column_value(row, ["Portfolio_Value", "Portfolio Value", "portfolio_value"]), 0.0),
-                    "Cash_Balance": safe_float(get_column_value(row, ["Cash_Balance", "Cash Balance", "cash_balance"]), 0.0),
-                    "Close": safe_float(row.get("Close", 0.0)),
-                    "Margin_Ratio": safe_float(get_column_value(row, ["Margin_Ratio", "Margin Ratio", "margin_ratio"]), 0.0),
-                    "spy_value": safe_float(spy_values.get(idx, 0.0)),
-                    "Interest_Paid": safe_float(get_column_value(row, ["Interest_Paid", "Interests_Paid", "Interests Paid", "interests_paid"]), 0.0),
-                    "Premiums_Received": safe_float(get_column_value(row, ["Premiums_Received", "Premiums Received", "premiums_received"]), 0.0),
-                    "Dividends_Received": safe_float(get_column_value(row, ["Dividends_Received", "dividends_received"]), 0.0),
-                    "Commissions_Paid": safe_float(get_column_value(row, ["Commissions_Paid", "Commissions Paid", "commissions_paid"]), 0.0),
-                    "Open_Positions": safe_int(get_column_value(row, ["Open_Positions", "Open Positions", "open_positions"]), 0),
-                    "Closed_Positions": safe_int(get_column_value(row, ["Closed_Positions", "Closed Positions", "closed_positions"]), 0),
-                    "Open": safe_float(row.get("Open", 0.0)),
-                    "High": safe_float(row.get("High", 0.0)),
-                    "Low": safe_float(row.get("Low", 0.0)),
-                    "VIX": safe_float(row.get("VIX", 0.0)),
-                    "Trading_Log": str(get_column_value(row, ["Trading_Log", "Trading Log", "trading_log"], "")),
-                }
-                
-                # Add to daily results
-                daily_results[date_str] = result_dict
-                
-                # Print the first day's data for debugging
-                if idx == cleaned_df.index[0]:
-                    print("First day data sample (after processing):")
-                    for k, v in result_dict.items():
-                        print(f"  {k}: {v}")
-
-            print(f"Processed {len(daily_results)} days of data")
-            
-            # Verify there's no NaN or Infinity in the results
-            print("Verifying no NaN or Infinity values in the final results...")
-            for date_str, data in daily_results.items():
-                for key, value in data.items():
-                    if isinstance(value, (int, float)) and (pd.isna(value) or np.isinf(value)):
-                        print(f"Warning: Found invalid value in final results: {key}={value} for date {date_str}")
-                        # Fix the value
-                        if key in ["Open_Positions", "Closed_Positions"]:
-                            daily_results[date_str][key] = 0
-                        else:
-                            daily_results[date_str][key] = 0.0
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("First day data sample (after processing):")
+                for k, v in daily_results[date_strs[0]].items():
+                    logger.debug("  %s: %s", k, v)
+
+            logger.info("Processed %s days of data", len(daily_results))
 
         else:
-            print("Warning: No results data returned from strategy simulation")
+            logger.warning("No results data returned from strategy simulation")
 
         return daily_results
 
     except Exception as e:
-        print(f"Error in run_spy_power_cashflow: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
+        logger.exception("Error in run_spy_power_cashflow: %s", e)
         raise
-    finally:
-        sys.path = original_path
 
 
 def get_default_expiration():
@@ -830,32 +1036,21 @@ def get_default_expiration():
 
 def run_options_martin(TradingSimulator, OptionStrategy, config, start_dt, end_dt, initial_balance=None):
     """Run the OPTIONS_MARTIN strategy simulation."""
-    strategy_path = STRATEGY_PATHS["OPTIONS_MARTIN"]
-    original_path = sys.path.copy()
+    import numpy as np
 
+    strategy_path = STRATEGY_PATHS["OPTIONS_MARTIN"]
     try:
+        # Left in place for later runs; the modules themselves are loaded by path
         if strategy_path not in sys.path:
             sys.path.insert(0, strategy_path)
-            print(f"Temporarily added {strategy_path} to sys.path")
+            logger.debug("Added %s to sys.path", strategy_path)
 
         # Import strategy modules using explicit path-based imports
-        import importlib.util
-
-        spec = importlib.util.spec_from_file_location("position", os.path.join(strategy_path, "position.py"))
-        position_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(position_module)
-        PositionTracker = position_module.PositionTracker
-
-        spec = importlib.util.spec_from_file_location("config", os.path.join(strategy_path, "config.py"))
-        config_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(config_module)
-        Config = config_module.Config
+        PositionTracker = _load_module(strategy_path, "position").PositionTracker
+        Config = _load_module(strategy_path, "config").Config
 
         # Import MarketData from OPTIONS_MARTIN (handles option price loading via IBKR service)
-        spec = importlib.util.spec_from_file_location("market_data", os.path.join(strategy_path, "market_data.py"))
-        market_data_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(market_data_module)
-        MarketData = market_data_module.MarketData
+        MarketData = _load_module(strategy_path, "market_data").MarketData
 
         # Create a Config object
         strategy_config = Config()
@@ -882,46 +1077,33 @@ def run_options_martin(TradingSimulator, OptionStrategy, config, start_dt, end_d
         strategy_config.USE_IV_SPIKE_EXIT = config.get("USE_IV_SPIKE_EXIT", False)
         strategy_config.IV_EXIT_THRESHOLD = float(config.get("IV_EXIT_THRESHOLD", 0.50))
 
-        # Get initial balance from request
-        try:
-            balance_sources = [
-                ("parameter", initial_balance),
-                ("config", "initial_balance"),
-                ("config", "initialBalance"),
-                ("config", "INITIAL_CASH"),
-            ]
-
-            for source_type, source in balance_sources:
-                if source_type == "parameter" and source is not None:
-                    strategy_config.INITIAL_CASH = float(source)
-                    print(f"Using initial balance from parameter: {source}")
-                    break
-                elif source_type == "config" and source in config:
-                    strategy_config.INITIAL_CASH = float(config[source])
-                    print(f"Using {source} from config: {config[source]}")
-                    break
-        except (ValueError, TypeError) as e:
-            print(f"Error parsing initial balance: {e}, using default")
+        _apply_initial_balance(strategy_config, config, initial_balance)
 
         # Debug print config
-        print("\n=== OPTIONS_MARTIN CONFIG DEBUG ===")
-        print("Full config from frontend:", config)
-        print(f"\nOption Contract: {strategy_config.SYMBOL} {strategy_config.STRIKE}{strategy_config.RIGHT} exp={strategy_config.EXPIRATION}")
-        print(f"Initial Cash: ${strategy_config.INITIAL_CASH:,.2f}")
-        print(f"Entry Size: {strategy_config.OPEN_POSITION} contracts")
-        print(f"Exit Target: {strategy_config.INC_INDEX}x")
-        print(f"Add-Load Trigger: {strategy_config.DEC_INDEX}x")
-        print(f"Max Pyramids: {strategy_config.MAX_ADD_LOADS}")
-        print(f"Bar Interval: {strategy_config.BAR_INTERVAL}")
-        print(f"\nIV Filtering:")
-        print(f"  Use IV Filter: {strategy_config.USE_IV_FILTER}")
-        print(f"  IV Entry Threshold: {strategy_config.IV_ENTRY_THRESHOLD}")
-        print(f"  Use IV Spike Exit: {strategy_config.USE_IV_SPIKE_EXIT}")
-        print(f"  IV Exit Threshold: {strategy_config.IV_EXIT_THRESHOLD}")
-        print("=== END CONFIG DEBUG ===")
+        logger.debug("=== OPTIONS_MARTIN CONFIG DEBUG ===")
+        logger.debug("Full config from frontend: %s", config)
+        logger.debug(
+            "Option Contract: %s %s%s exp=%s",
+            strategy_config.SYMBOL,
+            strategy_config.STRIKE,
+            strategy_config.RIGHT,
+            strategy_config.EXPIRATION,
+        )
+        logger.debug("Initial Cash: $%.2f", strategy_config.INITIAL_CASH)
+        logger.debug("Entry Size: %s contracts", strategy_config.OPEN_POSITION)
+        logger.debug("Exit Target: %sx", strategy_config.INC_INDEX)
+        logger.debug("Add-Load Trigger: %sx", strategy_config.DEC_INDEX)
+        logger.debug("Max Pyramids: %s", strategy_config.MAX_ADD_LOADS)
+        logger.debug("Bar Interval: %s", strategy_config.BAR_INTERVAL)
+        logger.debug("IV Filtering:")
+        logger.debug("  Use IV Filter: %s", strategy_config.USE_IV_FILTER)
+        logger.debug("  IV Entry Threshold: %s", strategy_config.IV_ENTRY_THRESHOLD)
+        logger.debug("  Use IV Spike Exit: %s", strategy_config.USE_IV_SPIKE_EXIT)
+        logger.debug("  IV Exit Threshold: %s", strategy_config.IV_EXIT_THRESHOLD)
+        logger.debug("=== END CONFIG DEBUG ===")
 
         # Initialize components
-        print("\n=== Initializing MarketData for OPTION ===")
+        logger.debug("=== Initializing MarketData for OPTION ===")
         market_data = MarketData(
             symbol=strategy_config.SYMBOL,
             strike=strategy_config.STRIKE,
@@ -930,72 +1112,24 @@ def run_options_martin(TradingSimulator, OptionStrategy, config, start_dt, end_d
             config=strategy_config
         )
 
-        # Convert datetime objects to string dates (handle both datetime and string input)
-        if isinstance(start_dt, str):
-            start_date_str = start_dt
-        else:
-            start_date_str = start_dt.strftime("%Y-%m-%d")
-
-        if isinstance(end_dt, str):
-            end_date_str = end_dt
-        else:
-            end_date_str = end_dt.strftime("%Y-%m-%d")
-
-        # Load option price data
-        print(f"Loading option data for date range: {start_date_str} to {end_date_str}")
-        market_data.load_data(start_date=start_date_str, end_date=end_date_str)
-        print(f"Option data loaded successfully")
-
-        print("\n=== Initializing PositionTracker ===")
-        position = PositionTracker(strategy_config.INITIAL_CASH, strategy_config)
-        print(f"PositionTracker initial balance: {position.cash}")
-
-        print("\n=== Initializing OptionStrategy ===")
-        strategy = OptionStrategy(strategy_config)
-        print(f"OptionStrategy type: {strategy_config.STRATEGY_TYPE}")
-
-        print("\n=== Creating TradingSimulator ===")
-        simulator = TradingSimulator(market_data, position, strategy, strategy_config)
-        print("TradingSimulator created with all components")
-
-        print("\n=== Running Simulation ===")
-        print(f"Running simulation from {start_date_str} to {end_date_str}")
-
-        results_df = simulator.run(start_date=start_date_str, end_date=end_date_str)
+        results_df, start_date_str, end_date_str = _run_simulator(
+            TradingSimulator, PositionTracker, OptionStrategy, market_data, strategy_config, start_dt, end_dt
+        )
 
         # Process results (same structure as SPY_POWER_CASHFLOW)
         daily_results = {}
         if results_df is not None and not results_df.empty:
-            print(f"Results DataFrame columns: {results_df.columns.tolist()}")
-
-            # Helper function for safe float conversion
-            def safe_float(value):
-                if pd.isna(value) or value is None:
-                    return 0.0
-                if isinstance(value, (int, float)):
-                    if np.isinf(value):
-                        return 0.0
-                    return float(value)
-                try:
-                    return float(value)
-                except (ValueError, TypeError):
-                    return 0.0
-
-            def get_column_value(row, possible_names, default):
-                for name in possible_names:
-                    if name in row.index and not pd.isna(row.get(name)):
-                        return row[name]
-                return default
+            logger.debug("Results DataFrame columns: %s", results_df.columns.tolist())
 
             # Clean dataframe
             cleaned_df = results_df.replace([np.inf, -np.inf], np.nan).fillna(0)
-            print(f"Cleaned DataFrame shape: {cleaned_df.shape}")
-            print(f"Cleaned DataFrame columns: {cleaned_df.columns.tolist()}")
+            logger.debug("Cleaned DataFrame shape: %s", cleaned_df.shape)
+            logger.debug("Cleaned DataFrame columns: %s", cleaned_df.columns.tolist())
 
             # Calculate IV statistics for frontend display
             iv_stats = None
-            print(f"🔍 Checking for ImpliedVolatility column...")
-            print(f"🔍 'ImpliedVolatility' in columns? {'ImpliedVolatility' in cleaned_df.columns}")
+            logger.debug("🔍 Checking for ImpliedVolatility column...")
+            logger.debug("🔍 'ImpliedVolatility' in columns? %s", "ImpliedVolatility" in cleaned_df.columns)
             if 'ImpliedVolatility' in cleaned_df.columns:
                 iv_values = cleaned_df['ImpliedVolatility'].replace(0, np.nan).dropna()
                 if len(iv_values) > 0:
@@ -1006,81 +1140,47 @@ def run_options_martin(TradingSimulator, OptionStrategy, config, start_dt, end_d
                         'iv_median': float(iv_values.median()),
                         'iv_std': float(iv_values.std()),
                     }
-                    print(f"\nIV Statistics for this backtest:")
-                    print(f"  Min: {iv_stats['iv_min']:.4f}")
-                    print(f"  Max: {iv_stats['iv_max']:.4f}")
-                    print(f"  Mean: {iv_stats['iv_mean']:.4f}")
-                    print(f"  Median: {iv_stats['iv_median']:.4f}")
-                    print(f"  Std Dev: {iv_stats['iv_std']:.4f}")
-
-            # Process each row into daily_results format
-            for idx in cleaned_df.index:
-                row = cleaned_df.loc[idx]
-                date_str = idx.strftime("%Y-%m-%d") if hasattr(idx, 'strftime') else str(idx)
-
-                result_dict = {
-                    "Cash_Balance": safe_float(row.get("Cash_Balance", 0.0)),
-                    "Position": int(safe_float(row.get("Position", 0))),
-                    "Position_Balance": safe_float(row.get("Position_Balance", 0.0)),
-                    "Portfolio_Value": safe_float(row.get("Portfolio_Value", 0.0)),
-                    "Total_Rounds": int(safe_float(row.get("Total_Rounds", 0))),
-                    "Total_Profit": safe_float(row.get("Total_Profit", 0.0)),
-                    "Close": safe_float(row.get("Close", 0.0)),
-                    "Open": safe_float(row.get("Open", 0.0)),
-                    "High": safe_float(row.get("High", 0.0)),
-                    "Low": safe_float(row.get("Low", 0.0)),
-                    "Trading_Log": str(get_column_value(row, ["Trading_Log", "Trading Log", "trading_log"], "")),
-                }
-
-                daily_results[date_str] = result_dict
+                    logger.debug("IV Statistics for this backtest:")
+                    logger.debug("  Min: %.4f", iv_stats["iv_min"])
+                    logger.debug("  Max: %.4f", iv_stats["iv_max"])
+                    logger.debug("  Mean: %.4f", iv_stats["iv_mean"])
+                    logger.debug("  Median: %.4f", iv_stats["iv_median"])
+                    logger.debug("  Std Dev: %.4f", iv_stats["iv_std"])
+
+            columns, date_strs = _result_columns("OPTIONS_MARTIN", cleaned_df)
+            daily_results = _zip_daily_results("OPTIONS_MARTIN", columns, date_strs)
 
             # Add IV statistics as metadata
             if iv_stats:
                 daily_results['__metadata__'] = {'iv_statistics': iv_stats}
 
-            print(f"Processed {len(daily_results)} days of data")
+            logger.info("Processed %s days of data", len(daily_results))
 
         else:
-            print("Warning: No results data returned from strategy simulation")
+            logger.warning("No results data returned from strategy simulation")
 
         return daily_results
 
     except Exception as e:
-        print(f"Error in run_options_martin: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
+        logger.exception("Error in run_options_martin: %s", e)
         raise
-    finally:
-        sys.path = original_path
 
 
 def run_spy500_leader(TradingSimulator, LeaderStrategy, config, start_dt, end_dt, initial_balance=None):
     """Run the SPY500_LEADER strategy simulation."""
-    strategy_path = STRATEGY_PATHS["SPY500_LEADER"]
-    original_path = sys.path.copy()
+    import numpy as np
 
+    strategy_path = STRATEGY_PATHS["SPY500_LEADER"]
     try:
+        # Left in place for later runs; the modules themselves are loaded by path
         if strategy_path not in sys.path:
             sys.path.insert(0, strategy_path)
-            print(f"Temporarily added {strategy_path} to sys.path")
+            logger.debug("Added %s to sys.path", strategy_path)
 
         # Import strategy modules using explicit path-based imports
-        import importlib.util
-
-        spec = importlib.util.spec_from_file_location("position", os.path.join(strategy_path, "position.py"))
-        position_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(position_module)
-        PositionTracker = position_module.PositionTracker
-
-        spec = importlib.util.spec_from_file_location("config", os.path.join(strategy_path, "config.py"))
-        config_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(config_module)
-        Config = config_module.Config
-
-        spec = importlib.util.spec_from_file_location("market_data", os.path.join(strategy_path, "market_data.py"))
-        market_data_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(market_data_module)
-        MarketData = market_data_module.MarketData
+        PositionTracker = _load_module(strategy_path, "position").PositionTracker
+        Config = _load_module(strategy_path, "config").Config
+        MarketData = _load_module(strategy_path, "market_data").MarketData
 
         # Create a Config object
         strategy_config = Config()
@@ -1094,96 +1194,29 @@ def run_spy500_leader(TradingSimulator, LeaderStrategy, config, start_dt, end_dt
         strategy_config.INITIAL_POSITION_PERCENT = float(config.get("INITIAL_POSITION_PERCENT", 0.6))
         strategy_config.SLIPPAGE_PERCENT = float(config.get("SLIPPAGE_PERCENT", 0.001))
 
-        # Get initial balance from request
-        try:
-            balance_sources = [
-                ("parameter", initial_balance),
-                ("config", "initial_balance"),
-                ("config", "initialBalance"),
-                ("config", "INITIAL_CASH"),
-            ]
-
-            for source_type, source in balance_sources:
-                if source_type == "parameter" and source is not None:
-                    strategy_config.INITIAL_CASH = float(source)
-                    print(f"Using initial balance from parameter: {source}")
-                    break
-                elif source_type == "config" and source in config:
-                    strategy_config.INITIAL_CASH = float(config[source])
-                    print(f"Using {source} from config: {config[source]}")
-                    break
-        except (ValueError, TypeError) as e:
-            print(f"Error parsing initial balance: {e}, using default")
+        _apply_initial_balance(strategy_config, config, initial_balance)
 
         # Debug print config
-        print("\n=== SPY500_LEADER CONFIG DEBUG ===")
-        print("Full config from frontend:", config)
-        print(f"Initial Cash: ${strategy_config.INITIAL_CASH:,.2f}")
-        print(f"Confirmation Days: {strategy_config.CONFIRMATION_DAYS}")
-        print(f"Initial Position %: {strategy_config.INITIAL_POSITION_PERCENT * 100}%")
-        print(f"Slippage %: {strategy_config.SLIPPAGE_PERCENT * 100}%")
-        print("=== END CONFIG DEBUG ===")
+        logger.debug("=== SPY500_LEADER CONFIG DEBUG ===")
+        logger.debug("Full config from frontend: %s", config)
+        logger.debug("Initial Cash: $%.2f", strategy_config.INITIAL_CASH)
+        logger.debug("Confirmation Days: %s", strategy_config.CONFIRMATION_DAYS)
+        logger.debug("Initial Position %%: %s%%", strategy_config.INITIAL_POSITION_PERCENT * 100)
+        logger.debug("Slippage %%: %s%%", strategy_config.SLIPPAGE_PERCENT * 100)
+        logger.debug("=== END CONFIG DEBUG ===")
 
         # Initialize components
-        print("\n=== Initializing MarketData for SPY500_LEADER ===")
+        logger.debug("=== Initializing MarketData for SPY500_LEADER ===")
         market_data = MarketData(config=strategy_config)
 
-        # Convert datetime objects to string dates (handle both datetime and string input)
-        if isinstance(start_dt, str):
-            start_date_str = start_dt
-        else:
-            start_date_str = start_dt.strftime("%Y-%m-%d")
-
-        if isinstance(end_dt, str):
-            end_date_str = end_dt
-        else:
-            end_date_str = end_dt.strftime("%Y-%m-%d")
-
-        # Load market cap and price data
-        print(f"Loading market data for date range: {start_date_str} to {end_date_str}")
-        market_data.load_data(start_date=start_date_str, end_date=end_date_str)
-        print(f"Market data loaded successfully")
-
-        print("\n=== Initializing PositionTracker ===")
-        position = PositionTracker(strategy_config.INITIAL_CASH, strategy_config)
-        print(f"PositionTracker initial balance: {position.cash}")
-
-        print("\n=== Initializing LeaderStrategy ===")
-        strategy = LeaderStrategy(strategy_config)
-        print(f"LeaderStrategy type: {strategy_config.STRATEGY_TYPE}")
-
-        print("\n=== Creating TradingSimulator ===")
-        simulator = TradingSimulator(market_data, position, strategy, strategy_config)
-        print("TradingSimulator created with all components")
-
-        print("\n=== Running Simulation ===")
-        print(f"Running simulation from {start_date_str} to {end_date_str}")
-
-        results_df = simulator.run(start_date=start_date_str, end_date=end_date_str)
+        results_df, start_date_str, end_date_str = _run_simulator(
+            TradingSimulator, PositionTracker, LeaderStrategy, market_data, strategy_config, start_dt, end_dt
+        )
 
         # Process results
         daily_results = {}
         if results_df is not None and not results_df.empty:
-            print(f"Results DataFrame columns: {results_df.columns.tolist()}")
-
-            # Helper function for safe float conversion
-            def safe_float(value):
-                if pd.isna(value) or value is None:
-                    return 0.0
-                if isinstance(value, (int, float)):
-                    if np.isinf(value):
-                        return 0.0
-                    return float(value)
-                try:
-                    return float(value)
-                except (ValueError, TypeError):
-                    return 0.0
-
-            def get_column_value(row, possible_names, default):
-                for name in possible_names:
-                    if name in row.index and not pd.isna(row.get(name)):
-                        return row[name]
-                return default
+            logger.debug("Results DataFrame columns: %s", results_df.columns.tolist())
 
             # Clean dataframe
             cleaned_df = results_df.replace([np.inf, -np.inf], np.nan).fillna(0)
@@ -1194,113 +1227,104 @@ def run_spy500_leader(TradingSimulator, LeaderStrategy, config, start_dt, end_dt
             spy_shares_bought = 0
 
             try:
-                conn = get_db_connection()
-                if conn:
-                    with conn.cursor() as cursor:
-                        cursor.execute("""
-                            SELECT date, close FROM market_data
-                            WHERE symbol = 'SPY' AND date >= %s AND date <= %s
-                            ORDER BY date
-                        """, (start_date_str, end_date_str))
-                        rows = cursor.fetchall()
-                        for row in rows:
-                            date_key = row[0].strftime("%Y-%m-%d") if hasattr(row[0], 'strftime') else str(row[0])[:10]
-                            spy_prices[date_key] = float(row[1])
-
-                    conn.close()
+                with get_db_connection() as conn:
+                    if conn:
+                        with conn.cursor() as cursor:
+                            cursor.execute("""
+                                SELECT date, close FROM market_data
+                                WHERE symbol = 'SPY' AND date >= %s AND date <= %s
+                                ORDER BY date
+                            """, (start_date_str, end_date_str))
+                            rows = cursor.fetchall()
+                            for row in rows:
+                                date_key = row[0].strftime("%Y-%m-%d") if hasattr(row[0], 'strftime') else str(row[0])[:10]
+                                spy_prices[date_key] = float(row[1])
 
                     if spy_prices:
                         first_spy_price = list(spy_prices.values())[0]
                         spy_shares_bought = initial_cash / first_spy_price if first_spy_price > 0 else 0
-                        print(f"Loaded {len(spy_prices)} SPY prices for comparison")
+                        logger.debug("Loaded %s SPY prices for comparison", len(spy_prices))
                     else:
-                        print("Warning: No SPY price data found, using fallback")
+                        logger.warning("No SPY price data found, using fallback")
             except Exception as e:
-                print(f"Warning: Could not load SPY prices: {e}")
-
-            # Process each row into daily_results format
-            for idx in cleaned_df.index:
-                row = cleaned_df.loc[idx]
-                date_str = idx.strftime("%Y-%m-%d") if hasattr(idx, 'strftime') else str(idx)
-
-                result_dict = {
-                    "Portfolio_Value": safe_float(row.get("Portfolio_Value", 0.0)),
-                    "Cash_Balance": safe_float(row.get("Cash_Balance", 0.0)),
-                    "Position_Value": safe_float(row.get("Position_Value", 0.0)),
-                    "Current_Holding": str(row.get("Current_Holding", "")),
-                    "Holding_Shares": int(safe_float(row.get("Holding_Shares", 0))),
-                    "Current_Leader": str(row.get("Current_Leader", "")),
-                    "Pending_Leader": str(row.get("Pending_Leader", "")),
-                    "Pending_Days": int(safe_float(row.get("Pending_Days", 0))),
-                    "Margin_Ratio": safe_float(row.get("Margin_Ratio", 0.0)),
-                    "Unrealized_PnL": safe_float(row.get("Unrealized_PnL", 0.0)),
-                    "Total_Trades": int(safe_float(row.get("Total_Trades", 0))),
-                    "Total_Slippage": safe_float(row.get("Total_Slippage", 0.0)),
-                    "Total_Commissions": safe_float(row.get("Total_Commissions", 0.0)),
-                    "Close": safe_float(row.get("Close", 0.0)),
-                    "Open": safe_float(row.get("Open", 0.0)),
-                    "High": safe_float(row.get("High", 0.0)),
-                    "Low": safe_float(row.get("Low", 0.0)),
-                    "Trading_Log": str(get_column_value(row, ["Trading_Log", "Trading Log", "trading_log"], "")),
-                    "spy_value": spy_prices.get(date_str, 0.0) * spy_shares_bought if spy_prices else safe_float(row.get("Close", 0.0)) * spy_shares_bought,
-                    "isSwapTransaction": str(get_column_value(row, ["Trading_Log", "Trading Log", "trading_log"], "")).startswith(("SWAP:", "INITIAL BUY:")),
-                }
-
-                daily_results[date_str] = result_dict
-
-            print(f"Processed {len(daily_results)} days of data")
+                logger.warning("Could not load SPY prices: %s", e)
+
+            columns, date_strs = _result_columns("SPY500_LEADER", cleaned_df)
+
+            # Buy & hold value from the SPY closes, or from the strategy's own Close without them
+            if spy_prices:
+                columns["spy_value"] = [spy_prices.get(date_str, 0.0) * spy_shares_bought for date_str in date_strs]
+            else:
+                columns["spy_value"] = [close * spy_shares_bought for close in columns["Close"]]
+            columns["isSwapTransaction"] = [
+                trading_log.startswith(("SWAP:", "INITIAL BUY:")) for trading_log in columns["Trading_Log"]
+            ]
+            daily_results = _zip_daily_results("SPY500_LEADER", columns, date_strs)
+
+            logger.info("Processed %s days of data", len(daily_results))
 
         else:
-            print("Warning: No results data returned from strategy simulation")
+            logger.warning("No results data returned from strategy simulation")
 
         return daily_results
 
     except Exception as e:
-        print(f"Error in run_spy500_leader: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
+        logger.exception("Error in run_spy500_leader: %s", e)
         raise
-    finally:
-        sys.path = original_path
 
 
-def get_simulations(limit=10, offset=0):
+def get_simulations(limit=10, offset=0, after_created_at=None, after_id=None):
     """
-    Get a list of simulation records from the database.
+    Get a list of simulation records from the database, newest first.
+
+    Pass the created_at and id of the last record of a page as after_created_at/after_id
+    to get the next page; this keyset form costs the same at any depth, unlike offset.
 
     Args:
         limit (int): Maximum number of records to return
-        offset (int): Offset for pagination
+        offset (int): Offset for pagination (ignored when after_created_at/after_id are given)
+        after_created_at (datetime): created_at of the last record of the previous page
+        after_id (int): id of the last record of the previous page
 
     Returns:
         list: List of simulation records
     """
-    conn = get_db_connection()
-    if not conn:
-        return []
+    from psycopg2.extras import RealDictCursor
 
-    try:
-        with conn.cursor(cursor_factory=DictCursor) as cursor:
-            cursor.execute(
-                """
-                SELECT id, strategy_type, config, start_date, end_date, initial_balance, created_at
-                FROM strategy_simulations
-                ORDER BY created_at DESC
-                LIMIT %s OFFSET %s
-            """,
-                (limit, offset),
-            )
-
-            simulations = []
-            for row in cursor.fetchall():
-                simulations.append(dict(row))
+    with get_db_connection() as conn:
+        if not conn:
+            return []
 
-            return simulations
-    except Exception as e:
-        print(f"Error retrieving simulations: {str(e)}")
-        return []
-    finally:
-        conn.close()
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                if after_created_at is not None and after_id is not None:
+                    # Keyset pagination: an index range scan on idx_strategy_simulations_created
+                    cursor.execute(
+                        """
+                        SELECT id, strategy_type, config, start_date, end_date, initial_balance, created_at
+                        FROM strategy_simulations
+                        WHERE (created_at, id) < (%s, %s)
+                        ORDER BY created_at DESC, id DESC
+                        LIMIT %s
+                    """,
+                        (after_created_at, after_id, limit),
+                    )
+                else:
+                    cursor.execute(
+                        """
+                        SELECT id, strategy_type, config, start_date, end_date, initial_balance, created_at
+                        FROM strategy_simulations
+                        ORDER BY created_at DESC, id DESC
+                        LIMIT %s OFFSET %s
+                    """,
+                        (limit, offset),
+                    )
+
+                # RealDictCursor rows are already plain dicts
+                return cursor.fetchall()
+        except Exception as e:
+            logger.error("Error retrieving simulations: %s", e)
+            return []
 
 
 def get_simulation_results(simulation_id):
@@ -1313,55 +1337,56 @@ def get_simulation_results(simulation_id):
     Returns:
         dict: Simulation data with daily performance
     """
-    conn = get_db_connection()
-    if not conn:
-        return None
+    from psycopg2.extras import RealDictCursor
 
-    try:
-        with conn.cursor(cursor_factory=DictCursor) as cursor:
-            # Get simulation metadata
-            cursor.execute(
-                """
-                SELECT id, strategy_type, config, start_date, end_date, initial_balance, created_at
-                FROM strategy_simulations
-                WHERE id = %s
-            """,
-                (simulation_id,),
-            )
+    with get_db_connection() as conn:
+        if not conn:
+            return None
 
-            sim_data = cursor.fetchone()
-            if not sim_data:
-                return None
-
-            simulation = dict(sim_data)
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                # Get simulation metadata
+                cursor.execute(
+                    """
+                    SELECT id, strategy_type, config, start_date, end_date, initial_balance, created_at
+                    FROM strategy_simulations
+                    WHERE id = %s
+                """,
+                    (simulation_id,),
+                )
 
-            # Get daily performance data
-            cursor.execute(
-                """
-                SELECT date, balance, trades_count, profit_loss
-                FROM daily_performance
-                WHERE simulation_id = %s
-                ORDER BY date
-            """,
-                (simulation_id,),
-            )
+                simulation = cursor.fetchone()
+                if not simulation:
+                    return None
 
+            # Get daily performance data through a named (server-side) cursor, streamed in
+            # DAILY_PERFORMANCE_ITERSIZE batches instead of buffering the whole result client-side
             days = {}
-            for row in cursor.fetchall():
-                day_data = dict(row)
-                days[day_data["date"].strftime("%Y-%m-%d")] = {
-                    "balance": day_data["balance"],
-                    "trades_count": day_data["trades_count"],
-                    "profit_loss": day_data["profit_loss"],
-                }
+            with conn.cursor(name="daily_performance_stream") as cursor:
+                cursor.itersize = DAILY_PERFORMANCE_ITERSIZE
+                # Dates arrive preformatted from Postgres, so rows need no strftime on this side
+                cursor.execute(
+                    """
+                    SELECT to_char(date, 'YYYY-MM-DD') AS date_str, balance, trades_count, profit_loss
+                    FROM daily_performance
+                    WHERE simulation_id = %s
+                    ORDER BY date
+                """,
+                    (simulation_id,),
+                )
+
+                for date_str, balance, trades_count, profit_loss in cursor:
+                    days[date_str] = {
+                        "balance": balance,
+                        "trades_count": trades_count,
+                        "profit_loss": profit_loss,
+                    }
 
             simulation["daily_results"] = days
             return simulation
-    except Exception as e:
-        print(f"Error retrieving simulation results: {str(e)}")
-        return None
-    finally:
-        conn.close()
+        except Exception as e:
+            logger.error("Error retrieving simulation results: %s", e)
+            return None
 
 
 def get_available_strategies():
@@ -1420,11 +1445,11 @@ def get_strategy_config_options(strategy_name):
 def test_imports():
     """Test function to verify imports work correctly"""
     try:
-        print("Importing MarketData...")
+        logger.debug("Importing MarketData...")
         from market_data import MarketData  # noqa:F401
 
-        print("Successfully imported MarketData")
+        logger.debug("Successfully imported MarketData")
         return True
     except ImportError as e:
-        print(f"Failed to import MarketData: {str(e)}")
+        logger.error("Failed to import MarketData: %s", e)
         return False